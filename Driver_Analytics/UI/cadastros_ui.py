@@ -2,17 +2,18 @@
 
 from __future__ import annotations
 
-from datetime import datetime, time
+from datetime import date, datetime, time
 
 import pandas as pd
 import streamlit as st
 
-from services.dashboard_service import DashboardService
+from services.dashboard_service import get_dashboard_service
 from services.backup_service import BackupService
 from UI.components import formatar_moeda, titulo_secao
+from UI.data_cache import RECORD_INDEX_NAME, as_datetime, carregar_registros, limpar_cache_dados
 
 
-service = DashboardService()
+service = get_dashboard_service()
 backup_service = BackupService()
 INVEST_CATEGORIAS = ["Renda Fixa", "Renda Variável"]
 DESPESAS_CATEGORIAS_NEGOCIO = sorted(
@@ -83,6 +84,17 @@ def _sync_categoria_despesa_por_esfera() -> None:
 
 
 def _safe_date_or_none(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return None if pd.isna(value) else value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip()[:10])
+        except ValueError:
+            pass
     parsed = pd.to_datetime(value, errors="coerce")
     if pd.isna(parsed):
         return None
@@ -99,7 +111,7 @@ def _safe_int(value) -> int:
 def _date_or_today(value):
     date_value = _safe_date_or_none(value)
     if date_value is None:
-        return pd.Timestamp.today().date()
+        return date.today()
     return date_value
 
 
@@ -111,9 +123,23 @@ def _time_from_seconds(value) -> time:
     return time(horas, minutos, segundos)
 
 
+def _indexed_position(df: pd.DataFrame, item_id: int) -> int | None:
+    """O(1) row position for frames indexed by id in the cached loader, None otherwise."""
+
+    if df.index.name != RECORD_INDEX_NAME:
+        return None
+    try:
+        return int(df.index.get_loc(int(item_id)))
+    except (KeyError, TypeError):
+        return -1
+
+
 def _get_row_by_id(df: pd.DataFrame, selected_id: int | None) -> pd.Series | None:
     if selected_id is None or df.empty or "id" not in df.columns:
         return None
+    position = _indexed_position(df, selected_id)
+    if position is not None:
+        return df.iloc[position] if position >= 0 else None
     row = df[df["id"] == int(selected_id)]
     if row.empty:
         return None
@@ -206,7 +232,7 @@ def _sync_edit_state(df: pd.DataFrame, select_key: str, last_key: str, setter) -
     return selected_id
 
 
-def _ensure_selected_option(select_key: str, options: list[int | None]) -> None:
+def _ensure_selected_option(select_key: str, options: list[int | None] | tuple[int | None, ...]) -> None:
     current = st.session_state.get(select_key)
     if current not in options:
         st.session_state[select_key] = options[0] if options else None
@@ -221,6 +247,9 @@ def _sort_desc_by_id(df: pd.DataFrame) -> pd.DataFrame:
 def _display_record_number(df: pd.DataFrame, item_id: int | None) -> int | None:
     if item_id is None or df.empty or "id" not in df.columns:
         return None
+    position = _indexed_position(df, item_id)
+    if position is not None and df.index.is_monotonic_decreasing:
+        return position + 1 if position >= 0 else None
     ordered = _sort_desc_by_id(df)
     matches = ordered.index[ordered["id"] == int(item_id)].tolist()
     return int(matches[0] + 1) if matches else None
@@ -312,16 +341,16 @@ def _patrimonio_atual(df: pd.DataFrame) -> float:
     if df is None or df.empty:
         return 0.0
     work = df.copy()
-    work["data"] = pd.to_datetime(work["data"], errors="coerce")
+    work["data"] = as_datetime(work["data"])
     work["patrimonio total"] = pd.to_numeric(work.get("patrimonio total"), errors="coerce").fillna(0.0)
     work = work.sort_values(by=["data", "id"], ascending=[True, True])
     return float(work.iloc[-1]["patrimonio total"]) if not work.empty else 0.0
 
 
+@st.fragment
 def render_receitas_cadastro() -> None:
     titulo_secao("Cadastro de Receitas")
-    df_receitas = _sort_desc_by_id(service.listar_receitas())
-    options = [None] + (df_receitas["id"].astype(int).tolist() if "id" in df_receitas.columns else [])
+    df_receitas, options = carregar_registros("receitas")
     st.selectbox("Registro", options=options, format_func=lambda x: _receita_label(df_receitas, x), key="cad_receita_selected_id")
     _sync_edit_state(df_receitas, "cad_receita_selected_id", "cad_receita_last_selected_id", _set_receita_fields)
     with st.form("cad_receita_form"):
@@ -343,6 +372,7 @@ def render_receitas_cadastro() -> None:
                     service.criar_receita(data_valida.isoformat(), float(valor), observacao=observacao)
                     st.success("Receita salva com sucesso.")
                     _reset_fields(["cad_receita_selected_id", "cad_receita_last_selected_id", "cad_receita_data", "cad_receita_valor", "cad_receita_km", "cad_receita_tempo", "cad_receita_obs", "cad_receita_confirmar_exclusao"])
+                    limpar_cache_dados()
                     st.rerun()
             if atualizar:
                 if selected_id is None:
@@ -352,6 +382,7 @@ def render_receitas_cadastro() -> None:
                 else:
                     service.atualizar_receita(int(selected_id), data_valida.isoformat(), float(valor), observacao=observacao)
                     st.success("Receita atualizada com sucesso.")
+                    limpar_cache_dados()
                     st.rerun()
             if excluir:
                 if selected_id is None:
@@ -362,6 +393,7 @@ def render_receitas_cadastro() -> None:
                     service.deletar_receita(int(selected_id))
                     st.success("Receita excluída com sucesso.")
                     _reset_fields(["cad_receita_selected_id", "cad_receita_last_selected_id", "cad_receita_confirmar_exclusao"])
+                    limpar_cache_dados()
                     st.rerun()
         except ValueError as exc:
             st.warning(str(exc))
@@ -369,10 +401,10 @@ def render_receitas_cadastro() -> None:
             st.error(f"Erro ao processar receita: {exc}")
 
 
+@st.fragment
 def render_despesas_cadastro() -> None:
     titulo_secao("Cadastro de Despesas")
-    df_despesas = _sort_desc_by_id(service.listar_despesas())
-    options = [None] + (df_despesas["id"].astype(int).tolist() if "id" in df_despesas.columns else [])
+    df_despesas, options = carregar_registros("despesas")
     st.selectbox("Registro", options=options, format_func=lambda x: _despesa_label(df_despesas, x), key="cad_despesa_selected_id")
     _sync_edit_state(df_despesas, "cad_despesa_selected_id", "cad_despesa_last_selected_id", _set_despesa_fields)
     st.selectbox("Escopo da despesa", options=ESFERAS_DESPESA_OPTIONS, key="cad_despesa_esfera")
@@ -427,6 +459,7 @@ def render_despesas_cadastro() -> None:
                     service.criar_despesa(data_valida.isoformat(), categoria_escolhida, float(valor), observacao, tipo_despesa=tipo_despesa, subcategoria_fixa=subcategoria_fixa, esfera_despesa=esfera_despesa, litros=float(litros), recorrencia_tipo=recorrencia_tipo, recorrencia_meses=recorrencia_meses)
                     st.success("Despesa salva com sucesso.")
                     _reset_fields(["cad_despesa_selected_id", "cad_despesa_last_selected_id", "cad_despesa_data", "cad_despesa_categoria_select", "cad_despesa_valor", "cad_despesa_obs", "cad_despesa_confirmar_exclusao", "cad_despesa_tipo", "cad_despesa_esfera", "cad_despesa_last_esfera", "cad_despesa_subcategoria_fixa", "cad_despesa_litros", "cad_despesa_recorrencia_tipo", "cad_despesa_recorrencia_meses", "cad_despesa_litros_disabled"])
+                    limpar_cache_dados()
                     st.rerun()
             if atualizar:
                 if selected_id is None:
@@ -440,6 +473,7 @@ def render_despesas_cadastro() -> None:
                 else:
                     service.atualizar_despesa(int(selected_id), data_valida.isoformat(), categoria_escolhida, float(valor), observacao, tipo_despesa=tipo_despesa, subcategoria_fixa=subcategoria_fixa, esfera_despesa=esfera_despesa, litros=float(litros), recorrencia_tipo=recorrencia_tipo, recorrencia_meses=recorrencia_meses, recorrencia_serie_id=recorrencia_serie_id)
                     st.success("Despesa atualizada com sucesso.")
+                    limpar_cache_dados()
                     st.rerun()
             if excluir:
                 if selected_id is None:
@@ -450,6 +484,7 @@ def render_despesas_cadastro() -> None:
                     service.deletar_despesa(int(selected_id))
                     st.success("Despesa excluída com sucesso.")
                     _reset_fields(["cad_despesa_selected_id", "cad_despesa_last_selected_id", "cad_despesa_confirmar_exclusao"])
+                    limpar_cache_dados()
                     st.rerun()
         except ValueError as exc:
             st.warning(str(exc))
@@ -503,6 +538,7 @@ def render_backup_section() -> None:
                         f"controle_litros={int(resultado.get('controle_litros', 0))}, "
                         f"categorias={int(resultado.get('categorias_despesas', 0))}."
                     )
+                    limpar_cache_dados()
                     st.rerun()
                 except ValueError as exc:
                     st.warning(str(exc))
@@ -2,16 +2,12 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
-
-def aplicar_estilo_global() -> None:
-    """Inject global CSS with better contrast and mobile readability."""
-
-    st.markdown(
-        """
+_GLOBAL_CSS = """
         <style>
         :root {
           --card-bg-dark: #172554;
@@ -172,9 +168,13 @@ def aplicar_estilo_global() -> None:
           }
         }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+"""
+
+
+def aplicar_estilo_global(target=None) -> None:
+    """Inject global CSS with better contrast and mobile readability."""
+
+    (target or st).markdown(_GLOBAL_CSS, unsafe_allow_html=True)
 
 
 def titulo_secao(texto: str) -> None:
@@ -184,13 +184,29 @@ def titulo_secao(texto: str) -> None:
     st.divider()
 
 
+_BR_DECIMAL = str.maketrans({",": ".", ".": ","})
+
+
+def formatar_numero(valor: float, sufixo: str = "") -> str:
+    """Format number with Brazilian separators: 1.234,56 (plus optional unit suffix)."""
+
+    texto = f"{float(valor):,.2f}".translate(_BR_DECIMAL)
+    return f"{texto} {sufixo}" if sufixo else texto
+
+
 def formatar_moeda(valor: float) -> str:
     """Format number using Brazilian currency style: R$ 1.234,56."""
 
-    numero = float(valor)
-    raw = f"{numero:,.2f}"
-    br = raw.replace(",", "_").replace(".", ",").replace("_", ".")
-    return f"R$ {br}"
+    return f"R$ {float(valor):,.2f}".translate(_BR_DECIMAL)
+
+
+def formatar_moeda_series(valores: pd.Series) -> pd.Series:
+    """Vectorized formatar_moeda for a whole column; each distinct amount is formatted once (invalid values as zero)."""
+
+    numeros = pd.to_numeric(valores, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    unicos, posicoes = np.unique(numeros, return_inverse=True)
+    textos = np.array([f"R$ {n:,.2f}".translate(_BR_DECIMAL) for n in unicos], dtype=object)
+    return pd.Series(textos[posicoes.reshape(-1)], index=valores.index, dtype=object)
 
 
 def format_currency(value: float) -> str:
@@ -211,11 +227,10 @@ def show_empty_data(message: str = "Sem dados para mostrar.") -> None:
     st.info(message)
 
 
-def render_hero_banner(usuario: str, secao: str) -> None:
+def _hero_html(usuario: str, secao: str) -> str:
     user = str(usuario or "").strip() or "Convidado"
     section = str(secao or "Dashboard").strip()
-    st.markdown(
-        f"""
+    return f"""
         <div class="da-hero">
             <div>
                 <div class="da-hero__title">Driver Analytics</div>
@@ -229,15 +244,24 @@ def render_hero_banner(usuario: str, secao: str) -> None:
                   <stop offset="100%" stop-color="#3b82f6"/>
                 </linearGradient>
               </defs>
-              <path d="M20 84c10-26 26-40 53-40h69c21 0 34 9 44 26l9 14h-20c-3-9-10-14-20-14H76c-10 0-18 5-21 14H20z" fill="url(#g1)" opacity="0.95"/>
+              <path d="M20 84c10-26 26-40 53-40h69c21 0 34 9 44 26l9 14h-20c-3-9-10-14-20-14H76c-10 0-18 5-21 14H20z"
+                    fill="url(#g1)" opacity="0.95"/>
               <circle cx="74" cy="86" r="13" fill="#0f172a"/><circle cx="74" cy="86" r="6" fill="#e2e8f0"/>
               <circle cx="157" cy="86" r="13" fill="#0f172a"/><circle cx="157" cy="86" r="6" fill="#e2e8f0"/>
               <path d="M90 54h42l18 16H76l14-16z" fill="#e0f2fe" opacity="0.9"/>
             </svg>
         </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    """
+
+
+def render_hero_banner(usuario: str, secao: str) -> None:
+    st.markdown(_hero_html(usuario, secao), unsafe_allow_html=True)
+
+
+def render_page_header(usuario: str, secao: str, target=None) -> None:
+    """Render global CSS and hero banner as a single markdown element."""
+
+    (target or st).markdown(_GLOBAL_CSS + _hero_html(usuario, secao), unsafe_allow_html=True)
 
 
 def _kpi_icon_for_title(titulo: str) -> str:
@@ -282,12 +306,14 @@ def render_kpi(titulo: str, valor: str | int | float, subtitulo: str | None = No
 def render_kpi_grid(items: list[tuple[str, str | int | float, str | None]], columns: int = 2) -> None:
     """Render KPI cards in a compact grid that stays readable on mobile."""
 
-    safe_columns = max(1, min(int(columns), 2))
+    if not items:
+        return
+    safe_columns = max(1, min(int(columns), 2, len(items)))
+    # One st.columns per row: stacked columns on mobile keep the cards in reading order.
     for index in range(0, len(items), safe_columns):
-        cols = st.columns(safe_columns)
-        for offset, item in enumerate(items[index : index + safe_columns]):
-            titulo, valor, subtitulo = item
-            with cols[offset]:
+        cols = st.columns(safe_columns, gap="small")
+        for col, (titulo, valor, subtitulo) in zip(cols, items[index : index + safe_columns]):
+            with col:
                 render_kpi(titulo, valor, subtitulo)
 
 
@@ -304,14 +330,26 @@ def render_graph(fig: go.Figure, height: int = 360, show_legend: bool = False) -
     st.plotly_chart(fig, use_container_width=True)
 
 
+def _format_money_columns(df: pd.DataFrame, money_columns: list[str] | None) -> pd.DataFrame:
+    formatadas = {col: formatar_moeda_series(df[col]) for col in money_columns or [] if col in df.columns}
+    return df.assign(**formatadas) if formatadas else df
+
+
 def render_table_preview(
     df: pd.DataFrame,
     columns: list[str],
     key_prefix: str,
     empty_message: str = "Sem dados para mostrar.",
     rows: int = 8,
+    column_config: dict | None = None,
+    newest_by: str | None = None,
+    money_columns: list[str] | None = None,
 ) -> None:
-    """Render compact table preview and optional full table."""
+    """Render compact table preview and optional full table.
+
+    With ``newest_by`` the preview takes the top rows by that column and the full table is sorted only on demand.
+    ``money_columns`` are formatted with formatar_moeda_series after the cut, so only the shown rows are formatted.
+    """
 
     if df is None or df.empty:
         show_empty_data(empty_message)
@@ -322,11 +360,15 @@ def render_table_preview(
         show_empty_data(empty_message)
         return
 
-    preview = df.loc[:, safe_cols].head(rows).copy()
-    st.dataframe(preview, use_container_width=True, hide_index=True)
+    sort_col = newest_by if newest_by and newest_by in df.columns else None
+    top = df.nlargest(rows, sort_col) if sort_col else df.head(rows)
+    preview = _format_money_columns(top.loc[:, safe_cols], money_columns)
+    st.dataframe(preview, use_container_width=True, hide_index=True, column_config=column_config)
 
     if st.button("Ver tabela completa", key=f"{key_prefix}_btn"):
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        full = df.sort_values(by=sort_col, ascending=False) if sort_col else df
+        full = _format_money_columns(full, money_columns)
+        st.dataframe(full, use_container_width=True, hide_index=True, column_config=column_config)
 
 
 # Backward compatibility alias
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Any
+
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from services.dashboard_service import DashboardService
+from core.auth import get_logged_user_id
+from core.config import cache_data
+from services.dashboard_service import get_dashboard_service
 from UI.components import (
-    format_currency,
     format_percent,
-    formatar_moeda,
+    formatar_moeda_series,
+    formatar_numero,
     render_graph,
     render_kpi_grid,
     render_kpi,
@@ -18,9 +22,28 @@ from UI.components import (
     show_empty_data,
     titulo_secao,
 )
-
-
-service = DashboardService()
+from UI.data_cache import CACHE_TTL_SECONDS, as_datetime, carregar_dados, render_refresh_button, versao_dados
+
+
+service = get_dashboard_service()
+_ESFERAS = ("NEGOCIO", "PESSOAL")
+_CURRENCY_KPIS = (
+    "receita_total",
+    "despesa_negocio",
+    "despesa_pessoal",
+    "despesa_total",
+    "lucro_total",
+    "receita_km",
+    "lucro_km",
+    "total_aportes_periodo",
+    "total_retiradas_invest",
+    "remuneracao_bruta",
+    "remuneracao_pos_invest",
+    "saldo_cpf",
+)
+_PREVIEW_COLUMN_CONFIG = {
+    "data": st.column_config.DateColumn("data", format="DD/MM/YYYY"),
+}
 
 
 def _set_dashboard_full_history(start_date, end_date) -> None:
@@ -28,20 +51,29 @@ def _set_dashboard_full_history(start_date, end_date) -> None:
     st.session_state["dash_end"] = end_date
 
 
-def _resolve_data_column(df: pd.DataFrame) -> str | None:
-    for col in df.columns:
+@lru_cache(maxsize=32)
+def _data_column_for(columns: tuple) -> str | None:
+    for col in columns:
         if isinstance(col, str) and col.strip().lower() == "data":
             return col
     return None
 
 
+def _resolve_data_column(df: pd.DataFrame) -> str | None:
+    return _data_column_for(tuple(df.columns))
+
+
 def _prepare_dates(df: pd.DataFrame) -> tuple[pd.DataFrame, str | None]:
+    """Parse and drop invalid dates in place; frames come from the cache as private copies."""
+
     data_col = _resolve_data_column(df)
-    safe_df = df.copy()
-    if data_col and not safe_df.empty:
-        safe_df[data_col] = pd.to_datetime(safe_df[data_col], errors="coerce")
-        safe_df = safe_df.dropna(subset=[data_col])
-    return safe_df, data_col
+    if data_col and not df.empty:
+        if not pd.api.types.is_datetime64_any_dtype(df[data_col]):
+            df[data_col] = pd.to_datetime(df[data_col], errors="coerce")
+        valid = df[data_col].notna()
+        if not valid.all():
+            df = df[valid]
+    return df, data_col
 
 
 def _safe_to_timestamp(value) -> pd.Timestamp | None:
@@ -51,20 +83,36 @@ def _safe_to_timestamp(value) -> pd.Timestamp | None:
     return pd.Timestamp(parsed)
 
 
+def _sorted_dates(series: pd.Series) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(series) and series.is_monotonic_increasing
+
+
+def _date_bounds(dates: pd.Series) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Min/max of a date column, read from the ends when the loader already sorted it."""
+
+    if _sorted_dates(dates):
+        return dates.iloc[0], dates.iloc[-1]
+    return dates.min(), dates.max()
+
+
 def _apply_period(df: pd.DataFrame, data_col: str | None, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
     if df.empty or not data_col:
         return df
-    return df[(df[data_col] >= start) & (df[data_col] <= end)]
+    dates = df[data_col]
+    if _sorted_dates(dates):
+        # Cached frames arrive sorted by date: binary search + contiguous slice, no mask.
+        return df.iloc[dates.searchsorted(start, side="left") : dates.searchsorted(end, side="right")]
+    return df[dates.between(start, end)]
 
 
-def _apply_period_interval(df: pd.DataFrame, start_col: str, end_col: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
-    if df.empty or start_col not in df.columns or end_col not in df.columns:
-        return pd.DataFrame(columns=df.columns if isinstance(df, pd.DataFrame) else [])
-    work = df.copy()
-    work[start_col] = pd.to_datetime(work[start_col], errors="coerce")
-    work[end_col] = pd.to_datetime(work[end_col], errors="coerce")
-    work = work.dropna(subset=[start_col, end_col])
-    return work[(work[start_col] <= end) & (work[end_col] >= start)]
+def _period_slice(
+    frames: dict[str, tuple[pd.DataFrame, str | None]],
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+) -> dict[str, pd.DataFrame]:
+    """Apply one [start, end] window to several frames, each filtered on its own date column."""
+
+    return {name: _apply_period(df, col, start, end) for name, (df, col) in frames.items()}
 
 
 def _weekday_metric(label: str, count: int) -> str:
@@ -112,20 +160,180 @@ def _fuel_summary_unit(df_controle_litros: pd.DataFrame) -> str:
     return "L"
 
 
+def _categorize_esfera(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize ``esfera_despesa`` once into a NEGOCIO/PESSOAL categorical."""
+
+    esfera_raw = df.get("esfera_despesa", pd.Series("NEGOCIO", index=df.index, dtype="object"))
+    df["esfera_despesa"] = pd.Categorical(
+        esfera_raw.fillna("NEGOCIO").astype(str).str.upper().str.strip(), categories=_ESFERAS
+    )
+    return df
+
+
+def _load_dashboard_frames() -> tuple[dict[str, tuple[pd.DataFrame, str | None]], pd.DataFrame]:
+    frames = {nome: _prepare_dates(carregar_dados(nome)) for nome in ("receitas", "controle_litros")}
+    frames["despesas"] = _prepare_dates(_categorize_esfera(carregar_dados("despesas")))
+    return frames, carregar_dados("investimentos")
+
+
+def _investimentos_periodo(
+    df_investimentos: pd.DataFrame, start_ts: pd.Timestamp, end_ts: pd.Timestamp
+) -> pd.DataFrame:
+    if df_investimentos.empty:
+        return pd.DataFrame()
+    df_investimentos = df_investimentos.copy()
+    data_inv_col = "data_fim" if "data_fim" in df_investimentos.columns else "data"
+    df_investimentos[data_inv_col] = as_datetime(df_investimentos[data_inv_col])
+    df_investimentos = df_investimentos.dropna(subset=[data_inv_col])
+    datas = df_investimentos[data_inv_col]
+    df_investimentos = df_investimentos[(datas >= start_ts) & (datas <= end_ts)]
+    df_investimentos["aporte"] = pd.to_numeric(df_investimentos.get("aporte"), errors="coerce").fillna(0.0)
+    tipo = df_investimentos.get("tipo_movimentacao", pd.Series(dtype="object"))
+    df_investimentos["tipo_movimentacao"] = tipo.fillna("").astype(str).str.upper().str.strip()
+    sem_tipo = df_investimentos["tipo_movimentacao"] == ""
+    df_investimentos.loc[sem_tipo, "tipo_movimentacao"] = df_investimentos["aporte"].map(
+        lambda v: "APORTE" if float(v) > 0 else ("RETIRADA" if float(v) < 0 else "RENDIMENTO")
+    )
+    return df_investimentos
+
+
+def _period_frames(
+    frames: dict[str, tuple[pd.DataFrame, str | None]],
+    df_investimentos: pd.DataFrame,
+    start_ts: pd.Timestamp,
+    end_ts: pd.Timestamp,
+) -> dict[str, pd.DataFrame]:
+    periodo = _period_slice(frames, start_ts, end_ts)
+    df_despesas_f = periodo["despesas"]
+    codes = df_despesas_f["esfera_despesa"].cat.codes.to_numpy()
+    periodo["despesas_negocio"] = df_despesas_f.iloc[codes == 0]
+    periodo["despesas_pessoal"] = df_despesas_f.iloc[codes == 1]
+    periodo["investimentos"] = _investimentos_periodo(df_investimentos, start_ts, end_ts)
+    return periodo
+
+
+@cache_data(ttl=CACHE_TTL_SECONDS, max_entries=32, show_spinner=False)
+def _metricas_periodo(
+    user_id: int | None, start_iso: str, end_iso: str, daily_goal: float, versao: int
+) -> dict[str, Any]:
+    """KPI bundle for one period, cached per user/window/goal and invalidated by data writes."""
+
+    start_ts = pd.Timestamp(start_iso)
+    end_base = pd.Timestamp(end_iso)
+    end_ts = end_base + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    frames, df_investimentos = _load_dashboard_frames()
+    periodo = _period_frames(frames, df_investimentos, start_ts, end_ts)
+    df_receitas_f = periodo["receitas"]
+    df_despesas_negocio = periodo["despesas_negocio"]
+    df_investimentos = periodo["investimentos"]
+
+    # Empty periods are common (e.g. a future month); skip the metric calls and keep zero defaults.
+    sem_receitas = df_receitas_f.empty
+    # One daily aggregation feeds total, worked days and % of goal days.
+    resumo_receitas = {} if sem_receitas else service.metrics.resumo_receitas(df_receitas_f, meta=daily_goal)
+    receita_total = 0.0 if sem_receitas else resumo_receitas["total"]
+    despesa_negocio = 0.0 if df_despesas_negocio.empty else service.metrics.despesa_total(df_despesas_negocio)
+    df_despesas_pessoal = periodo["despesas_pessoal"]
+    despesa_pessoal = 0.0 if df_despesas_pessoal.empty else service.metrics.despesa_total(df_despesas_pessoal)
+    despesa_total = 0.0 if periodo["despesas"].empty else service.metrics.despesa_total(periodo["despesas"])
+    lucro_total = float(receita_total - despesa_negocio)
+
+    km_snapshot = service.km_snapshot(start_ts, end_base)
+    km_remunerado = float(km_snapshot["km_remunerado"])
+    km_total_rodado = float(km_snapshot["km_total"])
+    km_remunerado_pct = float((km_remunerado / km_total_rodado) * 100.0) if km_total_rodado > 0 else 0.0
+    fuel_snapshot = service.fuel_consumption_snapshot(start_ts, end_base)
+    litros_combustivel = float(fuel_snapshot["litros_total_abastecidos"])
+    if litros_combustivel <= 0 and not df_despesas_negocio.empty:
+        litros_combustivel = service.metrics.litros_combustivel_total(df_despesas_negocio)
+
+    totais_mov = (
+        df_investimentos.groupby("tipo_movimentacao")["aporte"].sum()
+        if not df_investimentos.empty
+        else pd.Series(dtype="float64")
+    )
+    total_aportes_periodo = float(totais_mov.get("APORTE", 0.0))
+    total_retiradas_invest = float(totais_mov.get("RETIRADA", 0.0))
+    remuneracao_pos_invest = float(lucro_total - total_aportes_periodo + total_retiradas_invest)
+    return {
+        "receita_total": receita_total,
+        "despesa_total": despesa_total,
+        "despesa_negocio": despesa_negocio,
+        "despesa_pessoal": despesa_pessoal,
+        "lucro_total": lucro_total,
+        "margem_lucro": float(lucro_total / receita_total * 100) if receita_total else 0.0,
+        "dias": 0 if sem_receitas else resumo_receitas["dias_trabalhados"],
+        "meta_pct": 0.0 if sem_receitas else resumo_receitas["percentual_meta"],
+        "consistencia": service.metrics.analise_consistencia(
+            df_receitas_f, start_date=start_ts, end_date=end_base, meta=daily_goal
+        ),
+        "km_remunerado": km_remunerado,
+        "km_total_rodado": km_total_rodado,
+        "km_nao_remunerado": float(km_snapshot["km_nao_remunerado"]),
+        "receita_km": float(receita_total / km_remunerado) if km_remunerado > 0 else 0.0,
+        "lucro_km": float(lucro_total / km_remunerado) if km_remunerado > 0 else 0.0,
+        "km_remunerado_pct": km_remunerado_pct,
+        "km_nao_remunerado_pct": float(100.0 - km_remunerado_pct) if km_total_rodado > 0 else 0.0,
+        "litros_combustivel": litros_combustivel,
+        "litros_trechos_fechados": float(fuel_snapshot["litros_trechos_fechados"]),
+        "km_trechos_fechados": float(fuel_snapshot["km_trechos_fechados"]),
+        "trechos_fechados": int(fuel_snapshot["segment_count"]),
+        "consumo_km_l": float(fuel_snapshot["consumo_km_l"]),
+        "total_aportes_periodo": total_aportes_periodo,
+        "total_retiradas_invest": total_retiradas_invest,
+        "remuneracao_bruta": float(lucro_total),
+        "remuneracao_pos_invest": remuneracao_pos_invest,
+        "saldo_cpf": float(remuneracao_pos_invest - despesa_pessoal),
+    }
+
+
+@st.fragment
+def _render_previews(
+    df_receitas_f: pd.DataFrame,
+    data_col_receitas: str | None,
+    df_despesas_f: pd.DataFrame,
+    data_col_despesas: str | None,
+) -> None:
+    """Recent-records tables; 'Ver tabela completa' reruns only this fragment."""
+
+    titulo_secao("Prévia de Dados")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**Receitas recentes**")
+        render_table_preview(
+            df_receitas_f,
+            columns=["data", "valor", "km", "km_rodado_total", "tempo trabalhado"],
+            key_prefix="receitas_preview",
+            empty_message="Sem receitas no período selecionado.",
+            column_config=_PREVIEW_COLUMN_CONFIG,
+            newest_by=data_col_receitas,
+            money_columns=["valor"],
+        )
+
+    with col2:
+        st.markdown("**Despesas recentes**")
+        render_table_preview(
+            df_despesas_f,
+            columns=["data", "categoria", "esfera_despesa", "valor", "litros"],
+            key_prefix="despesas_preview",
+            empty_message="Sem despesas no período selecionado.",
+            column_config=_PREVIEW_COLUMN_CONFIG,
+            newest_by=data_col_despesas,
+            money_columns=["valor"],
+        )
+
+
 def pagina_dashboard() -> None:
     """Render responsive dashboard page."""
 
     st.header("Dashboard Geral")
 
-    df_receitas = service.listar_receitas()
-    df_despesas = service.listar_despesas()
-    df_controle_km = service.listar_controle_km()
-    df_controle_litros = service.listar_controle_litros() if hasattr(service, "listar_controle_litros") else pd.DataFrame()
-    df_investimentos = service.listar_investimentos()
-
-    df_receitas, data_col_receitas = _prepare_dates(df_receitas)
-    df_despesas, data_col_despesas = _prepare_dates(df_despesas)
-    df_controle_litros, data_col_controle_litros = _prepare_dates(df_controle_litros)
+    render_refresh_button("dash_refresh_data")
+    frames, df_investimentos = _load_dashboard_frames()
+    df_receitas, data_col_receitas = frames["receitas"]
+    df_despesas, data_col_despesas = frames["despesas"]
+    df_controle_litros, data_col_controle_litros = frames["controle_litros"]
 
     # Prefer full historical window when data exists to avoid "all-zero" first render.
     date_series: list[pd.Series] = []
@@ -135,21 +343,20 @@ def pagina_dashboard() -> None:
         (df_controle_litros, data_col_controle_litros),
     ]:
         if isinstance(frame, pd.DataFrame) and not frame.empty and col and col in frame.columns:
-            date_series.append(frame[col].dropna())
+            date_series.append(frame[col])
     if isinstance(df_investimentos, pd.DataFrame) and not df_investimentos.empty:
         inv_col = "data_fim" if "data_fim" in df_investimentos.columns else "data"
         if inv_col in df_investimentos.columns:
-            inv_dates = pd.to_datetime(df_investimentos[inv_col], errors="coerce").dropna()
+            inv_dates = as_datetime(df_investimentos[inv_col]).dropna()
             if not inv_dates.empty:
                 date_series.append(inv_dates)
 
-    today = pd.Timestamp.today().normalize()
     if date_series:
-        min_available = min(series.min() for series in date_series).normalize()
-        max_available = max(series.max() for series in date_series).normalize()
+        min_available = min(_date_bounds(series)[0] for series in date_series).normalize()
+        max_available = max(_date_bounds(series)[1] for series in date_series).normalize()
     else:
-        min_available = today.replace(day=1)
-        max_available = today
+        max_available = pd.Timestamp.today().normalize()
+        min_available = max_available.replace(day=1)
 
     st.session_state.setdefault("dash_start", min_available.date())
     st.session_state.setdefault("dash_end", max_available.date())
@@ -179,71 +386,40 @@ def pagina_dashboard() -> None:
 
     end_ts = end_base + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
 
-    df_receitas_f = _apply_period(df_receitas, data_col_receitas, start_ts, end_ts)
-    df_despesas_f = _apply_period(df_despesas, data_col_despesas, start_ts, end_ts)
-    df_controle_km_f = _apply_period_interval(df_controle_km, "data_inicio", "data_fim", start_ts, end_ts)
-    df_controle_litros_f = _apply_period(df_controle_litros, data_col_controle_litros, start_ts, end_ts)
-    if "esfera_despesa" in df_despesas_f.columns:
-        df_despesas_f = df_despesas_f.copy()
-        df_despesas_f["esfera_despesa"] = (
-            df_despesas_f["esfera_despesa"].fillna("NEGOCIO").astype(str).str.upper().str.strip()
-        )
-    else:
-        df_despesas_f = df_despesas_f.copy()
-        df_despesas_f["esfera_despesa"] = "NEGOCIO"
-
-    df_despesas_negocio = df_despesas_f[df_despesas_f["esfera_despesa"] == "NEGOCIO"]
-    df_despesas_pessoal = df_despesas_f[df_despesas_f["esfera_despesa"] == "PESSOAL"]
-    if not df_investimentos.empty:
-        df_investimentos = df_investimentos.copy()
-        data_inv_col = "data_fim" if "data_fim" in df_investimentos.columns else "data"
-        df_investimentos[data_inv_col] = pd.to_datetime(df_investimentos[data_inv_col], errors="coerce")
-        df_investimentos = df_investimentos.dropna(subset=[data_inv_col])
-        df_investimentos = df_investimentos[(df_investimentos[data_inv_col] >= start_ts) & (df_investimentos[data_inv_col] <= end_ts)]
-        df_investimentos["aporte"] = pd.to_numeric(df_investimentos.get("aporte"), errors="coerce").fillna(0.0)
-        df_investimentos["tipo_movimentacao"] = (
-            df_investimentos.get("tipo_movimentacao", pd.Series(dtype="object")).fillna("").astype(str).str.upper().str.strip()
-        )
-        df_investimentos.loc[df_investimentos["tipo_movimentacao"] == "", "tipo_movimentacao"] = df_investimentos["aporte"].map(
-            lambda v: "APORTE" if float(v) > 0 else ("RETIRADA" if float(v) < 0 else "RENDIMENTO")
-        )
-    else:
-        df_investimentos = pd.DataFrame()
+    periodo = _period_frames(frames, df_investimentos, start_ts, end_ts)
+    df_receitas_f = periodo["receitas"]
+    df_despesas_f = periodo["despesas"]
+    df_despesas_negocio = periodo["despesas_negocio"]
+    fuel_unit = _fuel_summary_unit(periodo["controle_litros"])
 
-    receita_total = service.metrics.receita_total(df_receitas_f)
     daily_goal = float(service.obter_daily_goal())
-    despesa_total = service.metrics.despesa_total(df_despesas_f)
-    despesa_negocio = service.metrics.despesa_total(df_despesas_negocio)
-    despesa_pessoal = service.metrics.despesa_total(df_despesas_pessoal)
-    lucro_total = service.metrics.lucro_bruto(df_receitas_f, df_despesas_negocio)
-    margem_lucro = service.metrics.margem_lucro(df_receitas_f, df_despesas_negocio)
-    dias = service.metrics.dias_trabalhados(df_receitas_f)
-    meta_pct = service.metrics.percentual_meta_batida(df_receitas_f, meta=daily_goal)
-    consistencia = service.metrics.analise_consistencia(df_receitas_f, start_date=start_ts, end_date=end_base, meta=daily_goal)
-
-    km_snapshot = service.km_snapshot(start_ts, end_base)
-    km_remunerado = float(km_snapshot["km_remunerado"])
-    km_total_rodado = float(km_snapshot["km_total"])
-    km_nao_remunerado = float(km_snapshot["km_nao_remunerado"])
-    receita_km = float(receita_total / km_remunerado) if km_remunerado > 0 else 0.0
-    lucro_km = float(lucro_total / km_remunerado) if km_remunerado > 0 else 0.0
-    km_remunerado_pct = float((km_remunerado / km_total_rodado) * 100.0) if km_total_rodado > 0 else 0.0
-    km_nao_remunerado_pct = float(100.0 - km_remunerado_pct) if km_total_rodado > 0 else 0.0
-    fuel_snapshot = service.fuel_consumption_snapshot(start_ts, end_base)
-    fuel_unit = _fuel_summary_unit(df_controle_litros_f)
-    litros_combustivel = float(fuel_snapshot["litros_total_abastecidos"])
-    litros_trechos_fechados = float(fuel_snapshot["litros_trechos_fechados"])
-    km_trechos_fechados = float(fuel_snapshot["km_trechos_fechados"])
-    trechos_fechados = int(fuel_snapshot["segment_count"])
-    consumo_km_l = float(fuel_snapshot["consumo_km_l"])
-    if litros_combustivel <= 0:
-        litros_combustivel = service.metrics.litros_combustivel_total(df_despesas_negocio)
-
-    total_aportes_periodo = float(df_investimentos[df_investimentos["tipo_movimentacao"] == "APORTE"]["aporte"].sum()) if not df_investimentos.empty else 0.0
-    total_retiradas_invest = float(df_investimentos[df_investimentos["tipo_movimentacao"] == "RETIRADA"]["aporte"].sum()) if not df_investimentos.empty else 0.0
-    remuneracao_bruta = float(lucro_total)
-    remuneracao_pos_invest = float(remuneracao_bruta - total_aportes_periodo + total_retiradas_invest)
-    saldo_cpf = float(remuneracao_pos_invest - despesa_pessoal)
+    metricas = _metricas_periodo(
+        get_logged_user_id(), start_ts.isoformat(), end_base.isoformat(), daily_goal, versao_dados()
+    )
+    receita_total = metricas["receita_total"]
+    despesa_negocio = metricas["despesa_negocio"]
+    despesa_pessoal = metricas["despesa_pessoal"]
+    lucro_total = metricas["lucro_total"]
+    margem_lucro = metricas["margem_lucro"]
+    dias = metricas["dias"]
+    meta_pct = metricas["meta_pct"]
+    consistencia = metricas["consistencia"]
+    km_remunerado = metricas["km_remunerado"]
+    km_total_rodado = metricas["km_total_rodado"]
+    km_nao_remunerado = metricas["km_nao_remunerado"]
+    lucro_km = metricas["lucro_km"]
+    km_remunerado_pct = metricas["km_remunerado_pct"]
+    km_nao_remunerado_pct = metricas["km_nao_remunerado_pct"]
+    litros_combustivel = metricas["litros_combustivel"]
+    litros_trechos_fechados = metricas["litros_trechos_fechados"]
+    km_trechos_fechados = metricas["km_trechos_fechados"]
+    trechos_fechados = metricas["trechos_fechados"]
+    consumo_km_l = metricas["consumo_km_l"]
+    total_aportes_periodo = metricas["total_aportes_periodo"]
+    total_retiradas_invest = metricas["total_retiradas_invest"]
+    remuneracao_bruta = metricas["remuneracao_bruta"]
+    saldo_cpf = metricas["saldo_cpf"]
+    moeda = formatar_moeda_series(pd.Series({**{k: metricas[k] for k in _CURRENCY_KPIS}, "daily_goal": daily_goal}))
 
     tab_cnpj, tab_cpf = st.tabs(["Dashboard CNPJ", "Dashboard CPF"])
 
@@ -252,47 +428,77 @@ def pagina_dashboard() -> None:
         st.caption("CNPJ: receitas e despesas do negócio, sem considerar despesas pessoais.")
         render_kpi_grid(
             [
-                ("Receita total", format_currency(receita_total), None),
-                ("Despesa negócio", format_currency(despesa_negocio), None),
-                ("Lucro", format_currency(lucro_total), None),
+                ("Receita total", moeda["receita_total"], None),
+                ("Despesa negócio", moeda["despesa_negocio"], None),
+                ("Lucro", moeda["lucro_total"], None),
                 ("Margem", format_percent(margem_lucro), "Lucro sobre receita do negócio"),
                 ("Dias trabalhados", int(dias), None),
-                ("% Meta batida", format_percent(meta_pct), f"Meta diária: {format_currency(daily_goal)}"),
-                ("Receita/KM", format_currency(receita_km), None),
-                ("Lucro/KM", format_currency(lucro_km), None),
+                ("% Meta batida", format_percent(meta_pct), f"Meta diária: {moeda['daily_goal']}"),
+                ("Receita/KM", moeda["receita_km"], None),
+                ("Lucro/KM", moeda["lucro_km"], None),
             ]
         )
 
         titulo_secao("Eficiência Energética")
         st.caption(
             "KM remunerado vem prioritariamente da Jornada. KM total rodado vem do Controle histórico por período "
-            "e, quando não existir, do cálculo derivado da Jornada com hodômetro; controles legados entram só como fallback. "
-            f"Consumo real (km/{fuel_unit}) é calculado por trechos fechados entre dois abastecimentos com tanque cheio."
+            "e, quando não existir, do cálculo derivado da Jornada com hodômetro; "
+            "controles legados entram só como fallback. "
+            f"Consumo real (km/{fuel_unit}) é calculado por trechos fechados "
+            "entre dois abastecimentos com tanque cheio."
         )
         render_kpi_grid(
             [
-                ("KM remunerado", f"{km_remunerado:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."), None),
-                ("KM total rodado", f"{km_total_rodado:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."), None),
-                ("KM não remunerado", f"{km_nao_remunerado:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."), None),
+                ("KM remunerado", formatar_numero(km_remunerado), None),
+                ("KM total rodado", formatar_numero(km_total_rodado), None),
+                ("KM não remunerado", formatar_numero(km_nao_remunerado), None),
                 ("% KM remunerado", format_percent(km_remunerado_pct), None),
                 ("% KM não remunerado", format_percent(km_nao_remunerado_pct), None),
-                ("Volume abastecido", f"{litros_combustivel:,.2f} {fuel_unit}".replace(",", "X").replace(".", ",").replace("X", "."), None),
+                ("Volume abastecido", formatar_numero(litros_combustivel, fuel_unit), None),
                 ("Consumo real", f"{consumo_km_l:.2f} km/{fuel_unit}", f"Trechos fechados: {trechos_fechados}"),
-                ("KM em trechos fechados", f"{km_trechos_fechados:,.2f} km".replace(",", "X").replace(".", ",").replace("X", "."), None),
-                ("Volume em trechos fechados", f"{litros_trechos_fechados:,.2f} {fuel_unit}".replace(",", "X").replace(".", ",").replace("X", "."), None),
-                ("Despesa total", format_currency(despesa_total), "Macro: negócio + pessoal"),
+                ("KM em trechos fechados", formatar_numero(km_trechos_fechados, "km"), None),
+                ("Volume em trechos fechados", formatar_numero(litros_trechos_fechados, fuel_unit), None),
+                ("Despesa total", moeda["despesa_total"], "Macro: negócio + pessoal"),
             ]
         )
 
         titulo_secao("Consistência Operacional")
         render_kpi_grid(
             [
-                ("Maior sequência trabalhada", f"{int(consistencia['longest_work_streak'])} dias", f"Atual: {int(consistencia['current_work_streak'])} dias"),
-                ("Maior sequência sem trabalhar", f"{int(consistencia['longest_absence_streak'])} dias", f"Atual: {int(consistencia['current_absence_streak'])} dias"),
-                ("Maior sequência meta batida", f"{int(consistencia['longest_meta_hit_streak'])} dias", f"Atual: {int(consistencia['current_meta_hit_streak'])} dias"),
-                ("Maior sequência meta não batida", f"{int(consistencia['longest_meta_miss_streak'])} dias", f"Atual: {int(consistencia['current_meta_miss_streak'])} dias"),
-                ("Dia de maior ausência", _weekday_metric(str(consistencia["most_absent_weekday"]), int(consistencia["most_absent_weekday_count"])), None),
-                ("Dia mais trabalhado", _weekday_metric(str(consistencia["most_worked_weekday"]), int(consistencia["most_worked_weekday_count"])), None),
+                (
+                    "Maior sequência trabalhada",
+                    f"{int(consistencia['longest_work_streak'])} dias",
+                    f"Atual: {int(consistencia['current_work_streak'])} dias",
+                ),
+                (
+                    "Maior sequência sem trabalhar",
+                    f"{int(consistencia['longest_absence_streak'])} dias",
+                    f"Atual: {int(consistencia['current_absence_streak'])} dias",
+                ),
+                (
+                    "Maior sequência meta batida",
+                    f"{int(consistencia['longest_meta_hit_streak'])} dias",
+                    f"Atual: {int(consistencia['current_meta_hit_streak'])} dias",
+                ),
+                (
+                    "Maior sequência meta não batida",
+                    f"{int(consistencia['longest_meta_miss_streak'])} dias",
+                    f"Atual: {int(consistencia['current_meta_miss_streak'])} dias",
+                ),
+                (
+                    "Dia de maior ausência",
+                    _weekday_metric(
+                        str(consistencia["most_absent_weekday"]), int(consistencia["most_absent_weekday_count"])
+                    ),
+                    None,
+                ),
+                (
+                    "Dia mais trabalhado",
+                    _weekday_metric(
+                        str(consistencia["most_worked_weekday"]), int(consistencia["most_worked_weekday_count"])
+                    ),
+                    None,
+                ),
             ]
         )
 
@@ -326,7 +532,7 @@ def pagina_dashboard() -> None:
         )
 
         titulo_secao("Score do Mês")
-        score = service.score_mensal(df_receitas.copy(), df_despesas_negocio.copy())
+        score = service.score_mensal(df_receitas, df_despesas_negocio)
         render_kpi("Pontuação", score, "Baseado no desempenho do negócio")
 
         titulo_secao("Análise Gráfica")
@@ -334,6 +540,8 @@ def pagina_dashboard() -> None:
             if receita_total == 0 and despesa_negocio == 0:
                 show_empty_data("Sem dados para gerar o gráfico no período selecionado.")
             else:
+                import plotly.express as px
+
                 df_chart = pd.DataFrame(
                     [
                         {"Métrica": "Lucro (R$)", "Valor": lucro_total, "Cor": "Lucro"},
@@ -360,15 +568,17 @@ def pagina_dashboard() -> None:
         )
         render_kpi_grid(
             [
-                ("Remuneração bruta", format_currency(remuneracao_bruta), "Lucro do negócio no período"),
-                ("Aportes em investimentos", format_currency(total_aportes_periodo), "Desconta da remuneração"),
-                ("Retiradas de investimentos", format_currency(total_retiradas_invest), "Soma à remuneração"),
-                ("Remuneração pós investimentos", format_currency(remuneracao_pos_invest), None),
-                ("Despesas pessoais", format_currency(despesa_pessoal), None),
-                ("Saldo CPF", format_currency(saldo_cpf), "Remuneração pós investimentos - despesas pessoais"),
+                ("Remuneração bruta", moeda["remuneracao_bruta"], "Lucro do negócio no período"),
+                ("Aportes em investimentos", moeda["total_aportes_periodo"], "Desconta da remuneração"),
+                ("Retiradas de investimentos", moeda["total_retiradas_invest"], "Soma à remuneração"),
+                ("Remuneração pós investimentos", moeda["remuneracao_pos_invest"], None),
+                ("Despesas pessoais", moeda["despesa_pessoal"], None),
+                ("Saldo CPF", moeda["saldo_cpf"], "Remuneração pós investimentos - despesas pessoais"),
             ]
         )
         if show_chart:
+            import plotly.express as px
+
             df_cpf = pd.DataFrame(
                 [
                     {"Métrica": "Remuneração bruta", "Valor": remuneracao_bruta},
@@ -382,37 +592,4 @@ def pagina_dashboard() -> None:
             fig_cpf.update_layout(height=370, margin=dict(l=20, r=20, t=20, b=20))
             render_graph(fig_cpf, height=370, show_legend=False)
 
-    titulo_secao("Prévia de Dados")
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Receitas recentes**")
-        receitas_preview = df_receitas_f.sort_values(by=data_col_receitas, ascending=False) if data_col_receitas else df_receitas_f
-        if data_col_receitas and not receitas_preview.empty:
-            receitas_preview = receitas_preview.copy()
-            receitas_preview[data_col_receitas] = receitas_preview[data_col_receitas].dt.date
-        if "valor" in receitas_preview.columns:
-            receitas_preview = receitas_preview.copy()
-            receitas_preview["valor"] = pd.to_numeric(receitas_preview["valor"], errors="coerce").fillna(0.0).apply(formatar_moeda)
-        render_table_preview(
-            receitas_preview,
-            columns=["data", "valor", "km", "km_rodado_total", "tempo trabalhado"],
-            key_prefix="receitas_preview",
-            empty_message="Sem receitas no período selecionado.",
-        )
-
-    with col2:
-        st.markdown("**Despesas recentes**")
-        despesas_preview = df_despesas_f.sort_values(by=data_col_despesas, ascending=False) if data_col_despesas else df_despesas_f
-        if data_col_despesas and not despesas_preview.empty:
-            despesas_preview = despesas_preview.copy()
-            despesas_preview[data_col_despesas] = despesas_preview[data_col_despesas].dt.date
-        if "valor" in despesas_preview.columns:
-            despesas_preview = despesas_preview.copy()
-            despesas_preview["valor"] = pd.to_numeric(despesas_preview["valor"], errors="coerce").fillna(0.0).apply(formatar_moeda)
-        render_table_preview(
-            despesas_preview,
-            columns=["data", "categoria", "esfera_despesa", "valor", "litros"],
-            key_prefix="despesas_preview",
-            empty_message="Sem despesas no período selecionado.",
-        )
+    _render_previews(df_receitas_f, data_col_receitas, df_despesas_f, data_col_despesas)
@@ -0,0 +1,121 @@
+"""Per-user cached reads shared by the Streamlit pages."""
+
+from __future__ import annotations
+
+import pandas as pd
+import streamlit as st
+
+from core.auth import get_logged_user_id
+from core.config import cache_data
+from services.dashboard_service import get_dashboard_service
+
+service = get_dashboard_service()
+_data_version = 0
+CACHE_TTL_SECONDS = 300
+_DATE_COLUMNS = ("data", "data_inicio", "data_fim")
+RECORD_INDEX_NAME = "_registro_id"
+# Narrower dtypes for columns whose range allows it; ids (bigserial) and money columns keep their 64-bit dtypes.
+_COMPACT_DTYPES = {"receitas": {"tempo trabalhado": "int32"}}
+
+
+def _compactar(df: pd.DataFrame, entidade: str) -> pd.DataFrame:
+    """Downcast the entity's known columns once, before the frame is cached."""
+
+    dtypes = {col: dtype for col, dtype in _COMPACT_DTYPES.get(entidade, {}).items() if col in df.columns}
+    return df.astype(dtypes) if dtypes else df
+
+
+@cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _load_tabela(entidade: str, user_id: int | None) -> pd.DataFrame:
+    """Fetch one entity table with dates parsed and rows in chronological order (cache keyed per user)."""
+
+    df = getattr(service, f"listar_{entidade}")()
+    date_cols = [col for col in _DATE_COLUMNS if col in df.columns]
+    for col in date_cols:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+    if date_cols and not df.empty:
+        df = df.sort_values(date_cols[0], kind="stable", na_position="first").reset_index(drop=True)
+    return _compactar(df, entidade)
+
+
+@cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _load_registros(entidade: str, user_id: int | None) -> tuple[pd.DataFrame, tuple[int | None, ...]]:
+    """Cadastro view of a table: sorted by descending id and indexed by id."""
+
+    df = _load_tabela(entidade, user_id)
+    if df.empty or "id" not in df.columns:
+        return df, (None,)
+    df["id"] = pd.to_numeric(df["id"], errors="coerce").fillna(0).astype("int64")
+    df = df.sort_values("id", ascending=False, kind="stable")
+    df.index = pd.Index(df["id"].to_numpy(), name=RECORD_INDEX_NAME)
+    return df, (None, *df["id"].tolist())
+
+
+@cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def _load_periodo(entidade: str, user_id: int | None, inicio: str, fim: str) -> pd.DataFrame:
+    """Fetch only the rows with inicio <= data < fim; the date filter runs in the database."""
+
+    df = getattr(service, f"listar_{entidade}_periodo")(inicio, fim)
+    if "data" in df.columns:
+        df["data"] = pd.to_datetime(df["data"], errors="coerce")
+        if not df.empty:
+            df = df.sort_values("data", kind="stable", na_position="first").reset_index(drop=True)
+    return _compactar(df, entidade)
+
+
+def carregar_dados(entidade: str) -> pd.DataFrame:
+    """Return the cached table for the logged user."""
+
+    return _load_tabela(entidade, get_logged_user_id())
+
+
+def carregar_registros(entidade: str) -> tuple[pd.DataFrame, tuple[int | None, ...]]:
+    """Return cached records and selectbox options (None first) for the logged user."""
+
+    return _load_registros(entidade, get_logged_user_id())
+
+
+def carregar_periodo(entidade: str, inicio: pd.Timestamp, fim_exclusivo: pd.Timestamp) -> pd.DataFrame:
+    """Return the logged user's rows of one period, cached per (user, period)."""
+
+    return _load_periodo(entidade, get_logged_user_id(), inicio.date().isoformat(), fim_exclusivo.date().isoformat())
+
+
+def fatiar_periodo(df: pd.DataFrame, data_col: str, inicio: pd.Timestamp, fim_exclusivo: pd.Timestamp) -> pd.DataFrame:
+    """Rows with inicio <= data_col < fim_exclusivo; binary search when the column is sorted (as cached tables are)."""
+
+    datas = df[data_col]
+    if pd.api.types.is_datetime64_any_dtype(datas) and datas.is_monotonic_increasing:
+        return df.iloc[datas.searchsorted(inicio, side="left") : datas.searchsorted(fim_exclusivo, side="left")]
+    return df[(datas >= inicio) & (datas < fim_exclusivo)]
+
+
+def as_datetime(series: pd.Series) -> pd.Series:
+    """Parse dates unless the column already is datetime (cached tables arrive parsed)."""
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors="coerce")
+
+
+def versao_dados() -> int:
+    """Counter bumped on every write; include it in keys of caches derived from these reads."""
+
+    return _data_version
+
+
+def limpar_cache_dados() -> None:
+    """Drop cached reads after any write so the next rerun sees fresh data."""
+
+    global _data_version
+    _data_version += 1
+    _load_tabela.clear()
+    _load_registros.clear()
+    _load_periodo.clear()
+
+
+def render_refresh_button(key: str) -> None:
+    """Sidebar button that forces a fresh read from the database."""
+
+    if st.sidebar.button("Atualizar dados", key=key, help="Recarrega os dados do banco ignorando o cache."):
+        limpar_cache_dados()
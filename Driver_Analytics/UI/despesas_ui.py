@@ -6,12 +6,13 @@ import pandas as pd
 import plotly.express as px
 import streamlit as st
 
-from services.dashboard_service import DashboardService
+from services.dashboard_service import get_dashboard_service
 from UI.cadastros_ui import _with_display_order, render_despesas_cadastro
-from UI.components import format_currency, formatar_moeda, render_kpi, render_kpi_grid, show_empty_data, titulo_secao
+from UI.components import format_currency, formatar_moeda_series, render_kpi, render_kpi_grid, show_empty_data, titulo_secao
+from UI.data_cache import as_datetime, carregar_dados, fatiar_periodo, render_refresh_button
 
 
-service = DashboardService()
+service = get_dashboard_service()
 ESFERA_LABEL_MAP = {"NEGOCIO": "Negócio", "PESSOAL": "Pessoal"}
 ESFERA_COLOR_MAP = {"Negócio": "#1f77b4", "Pessoal": "#ff7f0e"}
 
@@ -43,27 +44,27 @@ def _intervalo_referencia(modo_periodo: str, ano: int | None, mes: int | None, d
 def pagina_despesas() -> None:
     st.header("Despesas")
 
-    df = service.listar_despesas()
-    if "data" in df.columns:
-        df["data"] = pd.to_datetime(df["data"], errors="coerce")
-    df = _normalizar_tipo_despesa(df)
+    render_refresh_button("desp_refresh_data")
+    df = _normalizar_tipo_despesa(carregar_dados("despesas"))
 
     modo_periodo = st.radio("Visualização", ["Mensal", "Personalizado"], horizontal=True, key="desp_modo_periodo")
 
-    df_filtrado = df.copy()
+    df_filtrado = df
     titulo_resumo = "Resumo do Mês"
     ano = None
     mes = None
     data_inicial = None
     data_final = None
     if modo_periodo == "Mensal":
+        hoje = pd.Timestamp.today()
         col1, col2 = st.columns(2)
         with col1:
-            ano = st.number_input("Ano", value=pd.Timestamp.today().year, key="desp_ano")
+            ano = st.number_input("Ano", value=hoje.year, key="desp_ano")
         with col2:
-            mes = st.number_input("Mês", min_value=1, max_value=12, value=pd.Timestamp.today().month, key="desp_mes")
+            mes = st.number_input("Mês", min_value=1, max_value=12, value=hoje.month, key="desp_mes")
         if not df_filtrado.empty and "data" in df_filtrado.columns:
-            df_filtrado = df_filtrado[(df_filtrado["data"].dt.year == int(ano)) & (df_filtrado["data"].dt.month == int(mes))]
+            inicio_mes = pd.Timestamp(year=int(ano), month=int(mes), day=1)
+            df_filtrado = fatiar_periodo(df_filtrado, "data", inicio_mes, inicio_mes + pd.offsets.MonthBegin(1))
     else:
         titulo_resumo = "Resumo do Período"
         if df_filtrado.empty or "data" not in df_filtrado.columns or df_filtrado["data"].dropna().empty:
@@ -98,14 +99,14 @@ def pagina_despesas() -> None:
                 fim = None
             else:
                 inicio = pd.to_datetime(data_inicial)
-                fim = pd.to_datetime(data_final) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-                df_filtrado = df_filtrado[(df_filtrado["data"] >= inicio) & (df_filtrado["data"] <= fim)]
+                fim = pd.to_datetime(data_final) + pd.Timedelta(days=1)
+                df_filtrado = fatiar_periodo(df_filtrado, "data", inicio, fim)
 
     titulo_secao(titulo_resumo)
     total = service.metrics.despesa_total(df_filtrado)
     media = service.metrics.despesa_media(df_filtrado)
-    despesas_negocio = df_filtrado[df_filtrado["esfera_despesa"] == "NEGOCIO"].copy()
-    despesas_pessoal = df_filtrado[df_filtrado["esfera_despesa"] == "PESSOAL"].copy()
+    despesas_negocio = df_filtrado[df_filtrado["esfera_despesa"] == "NEGOCIO"]
+    despesas_pessoal = df_filtrado[df_filtrado["esfera_despesa"] == "PESSOAL"]
     total_negocio = service.metrics.despesa_total(despesas_negocio)
     total_pessoal = service.metrics.despesa_total(despesas_pessoal)
 
@@ -124,12 +125,12 @@ def pagina_despesas() -> None:
     dias_ref = max(1, int((pd.to_datetime(fim_ref) - pd.to_datetime(inicio_ref)).days + 1))
 
     titulo_secao("Projeções e Recorrência")
-    recorrentes = df_filtrado[df_filtrado["tipo_despesa"] == "RECORRENTE"].copy()
+    recorrentes = df_filtrado[df_filtrado["tipo_despesa"] == "RECORRENTE"]
     total_recorrente = float(pd.to_numeric(recorrentes.get("valor"), errors="coerce").fillna(0.0).sum()) if not recorrentes.empty else 0.0
     proj_semana = float(total_recorrente / dias_ref * 7.0)
     proj_mes = float(total_recorrente / dias_ref * 30.0)
-    rec_negocio = recorrentes[recorrentes["esfera_despesa"] == "NEGOCIO"].copy()
-    rec_pessoal = recorrentes[recorrentes["esfera_despesa"] == "PESSOAL"].copy()
+    rec_negocio = recorrentes[recorrentes["esfera_despesa"] == "NEGOCIO"]
+    rec_pessoal = recorrentes[recorrentes["esfera_despesa"] == "PESSOAL"]
     total_rec_negocio = float(pd.to_numeric(rec_negocio.get("valor"), errors="coerce").fillna(0.0).sum()) if not rec_negocio.empty else 0.0
     total_rec_pessoal = float(pd.to_numeric(rec_pessoal.get("valor"), errors="coerce").fillna(0.0).sum()) if not rec_pessoal.empty else 0.0
 
@@ -190,7 +191,7 @@ def pagina_despesas() -> None:
             st.plotly_chart(fig_categoria, use_container_width=True)
 
         titulo_secao(f"Contas Fixas por Subcategoria ({esfera_label})")
-        fixas = df_scope[df_scope["tipo_despesa"] == "FIXA"].copy()
+        fixas = df_scope[df_scope["tipo_despesa"] == "FIXA"]
         if fixas.empty:
             show_empty_data("Sem despesas fixas no período selecionado.")
         else:
@@ -217,17 +218,18 @@ def pagina_despesas() -> None:
                 labels={"subcat": "Subcategoria", "valor": "Valor"},
             )
             st.plotly_chart(fig_fixas, use_container_width=True)
-            tabela_fixas = grupo.copy()
-            tabela_fixas["valor"] = tabela_fixas["valor"].apply(formatar_moeda)
-            tabela_fixas["percentual"] = tabela_fixas["percentual"].map(lambda x: f"{x:.1f}%")
+            tabela_fixas = grupo.assign(
+                valor=formatar_moeda_series(grupo["valor"]),
+                percentual=grupo["percentual"].map(lambda x: f"{x:.1f}%"),
+            )
             st.dataframe(tabela_fixas.rename(columns={"subcat": "subcategoria"}), use_container_width=True, hide_index=True)
 
         titulo_secao(f"Registros ({esfera_label})")
         df_tabela = _with_display_order(df_scope)
         if "data" in df_tabela.columns:
-            df_tabela["data"] = pd.to_datetime(df_tabela["data"], errors="coerce").dt.date
+            df_tabela["data"] = as_datetime(df_tabela["data"]).dt.date
         if "valor" in df_tabela.columns:
-            df_tabela["valor"] = pd.to_numeric(df_tabela["valor"], errors="coerce").fillna(0.0).apply(formatar_moeda)
+            df_tabela["valor"] = formatar_moeda_series(df_tabela["valor"])
         if "litros" in df_tabela.columns:
             df_tabela["litros"] = pd.to_numeric(df_tabela["litros"], errors="coerce").fillna(0.0).map(lambda x: f"{x:.2f}")
         if "tipo_despesa" in df_tabela.columns:
@@ -239,9 +241,9 @@ def pagina_despesas() -> None:
         st.dataframe(df_tabela, use_container_width=True, hide_index=True)
 
     with tab_negocio:
-        _render_aba_escopo(df_filtrado[df_filtrado["esfera_despesa"] == "NEGOCIO"].copy(), "Negócio", "negocio")
+        _render_aba_escopo(df_filtrado[df_filtrado["esfera_despesa"] == "NEGOCIO"], "Negócio", "negocio")
 
     with tab_pessoal:
-        _render_aba_escopo(df_filtrado[df_filtrado["esfera_despesa"] == "PESSOAL"].copy(), "Pessoal", "pessoal")
+        _render_aba_escopo(df_filtrado[df_filtrado["esfera_despesa"] == "PESSOAL"], "Pessoal", "pessoal")
 
     render_despesas_cadastro()
@@ -2,17 +2,18 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from core.config import cache_data
 from Metrics.analytics_investimentos import (
     calcular_cagr,
     lucro_acumulado,
     patrimonio_atual as analytics_patrimonio_atual,
     patrimonio_inicial,
-    projecao_com_aporte,
     rentabilidade_percentual,
     total_aportado,
 )
@@ -33,90 +34,82 @@ from UI.cadastros_ui import (
     _sync_edit_state,
     _with_display_order,
 )
-from UI.components import format_currency, format_percent, formatar_moeda, render_kpi_grid, show_empty_data, titulo_secao
-from services.dashboard_service import DashboardService
+from UI.components import format_currency, format_percent, formatar_moeda_series, render_kpi_grid, show_empty_data, titulo_secao
+from UI.data_cache import as_datetime, carregar_dados, fatiar_periodo, limpar_cache_dados, render_refresh_button
+from services.dashboard_service import get_dashboard_service
 
 
-service = DashboardService()
+service = get_dashboard_service()
 TIPO_MOVIMENTACAO_LABELS = {
     "APORTE": "Aporte",
     "RENDIMENTO": "Rendimento",
     "RETIRADA": "Retirada",
 }
+_INVEST_DATE_COLUMNS = ("data", "data_inicio", "data_fim")
+_INVEST_NUMERIC_COLUMNS = ("aporte", "total aportado", "rendimento", "patrimonio total")
+_INVEST_COLUMNS = ("id", *_INVEST_DATE_COLUMNS, "tipo_movimentacao", "categoria", *_INVEST_NUMERIC_COLUMNS)
 
 
-def _signed_aporte(row: pd.Series) -> float:
-    aporte = float(pd.to_numeric(pd.Series([row.get("aporte", 0.0)]), errors="coerce").fillna(0.0).iloc[0])
-    tipo = str(row.get("tipo_movimentacao", "") or "").strip().upper()
-    if tipo == "RETIRADA":
-        return -abs(aporte)
-    if tipo == "APORTE":
-        return abs(aporte)
-    return aporte
+def _signed_aporte(aporte: pd.Series, tipo: pd.Series) -> np.ndarray:
+    """Retiradas count negative and aportes positive; other movements keep the stored sign."""
+
+    valores = aporte.to_numpy(dtype=float)
+    return np.select([tipo.eq("RETIRADA"), tipo.eq("APORTE")], [-np.abs(valores), np.abs(valores)], default=valores)
 
 
 def _prepare_investimentos(df: pd.DataFrame) -> pd.DataFrame:
-    work = df.copy() if isinstance(df, pd.DataFrame) else pd.DataFrame()
-    for col in [
-        "id",
-        "data",
-        "data_inicio",
-        "data_fim",
-        "tipo_movimentacao",
-        "categoria",
-        "aporte",
-        "total aportado",
-        "rendimento",
-        "patrimonio total",
-    ]:
-        if col not in work.columns:
-            work[col] = pd.Series(dtype="object")
+    work = df if isinstance(df, pd.DataFrame) else pd.DataFrame()
+    work = work.assign(
+        **{col: pd.Series(dtype="object", index=work.index) for col in _INVEST_COLUMNS if col not in work.columns}
+    )
 
-    for col in ["data", "data_inicio", "data_fim"]:
-        work[col] = pd.to_datetime(work[col], errors="coerce")
-    for col in ["aporte", "total aportado", "rendimento", "patrimonio total"]:
-        work[col] = pd.to_numeric(work[col], errors="coerce").fillna(0.0)
-
-    work["categoria"] = work["categoria"].fillna("Renda Fixa").astype(str).str.strip()
-    work.loc[work["categoria"] == "", "categoria"] = "Renda Fixa"
-    work["tipo_movimentacao"] = work["tipo_movimentacao"].fillna("").astype(str).str.upper().str.strip()
-    work.loc[~work["tipo_movimentacao"].isin(TIPO_MOVIMENTACAO_LABELS.keys()), "tipo_movimentacao"] = (
-        work["aporte"].map(lambda v: "APORTE" if float(v) > 0 else ("RETIRADA" if float(v) < 0 else "RENDIMENTO"))
+    numericos = {col: pd.to_numeric(work[col], errors="coerce").fillna(0.0) for col in _INVEST_NUMERIC_COLUMNS}
+    categoria = work["categoria"].fillna("").astype(str).str.strip()
+    tipo = work["tipo_movimentacao"].fillna("").astype(str).str.upper().str.strip()
+    aporte = numericos["aporte"]
+    inferido = np.select([aporte > 0, aporte < 0], ["APORTE", "RETIRADA"], default="RENDIMENTO")
+    tipo = tipo.where(tipo.isin(TIPO_MOVIMENTACAO_LABELS.keys()), inferido)
+    categoria = categoria.mask(categoria.eq(""), "Renda Fixa")
+    categorias = pd.CategoricalDtype(categories=list(dict.fromkeys([*INVEST_CATEGORIAS, *sorted(categoria.unique())])))
+    return work.assign(
+        **{col: as_datetime(work[col]) for col in _INVEST_DATE_COLUMNS},
+        **numericos,
+        categoria=categoria.astype(categorias),
+        tipo_movimentacao=tipo,
+        aporte_signed=_signed_aporte(aporte, tipo),
     )
-    work["aporte_signed"] = work.apply(_signed_aporte, axis=1)
-    return work
 
 
 def _analytics_frame(df: pd.DataFrame) -> pd.DataFrame:
-    work = df.copy()
-    if "patrimonio total" in work.columns and "patrimonio_total" not in work.columns:
-        work["patrimonio_total"] = work["patrimonio total"]
-    if "total aportado" in work.columns and "total_aportado" not in work.columns:
-        work["total_aportado"] = work["total aportado"]
-    if "aporte_signed" in work.columns:
-        work["aporte"] = work["aporte_signed"]
-    return work
+    aliases = {}
+    if "patrimonio total" in df.columns and "patrimonio_total" not in df.columns:
+        aliases["patrimonio_total"] = df["patrimonio total"]
+    if "total aportado" in df.columns and "total_aportado" not in df.columns:
+        aliases["total_aportado"] = df["total aportado"]
+    if "aporte_signed" in df.columns:
+        aliases["aporte"] = df["aporte_signed"]
+    return df.assign(**aliases)
 
 
 def _filter_period(df: pd.DataFrame, modo_periodo: str) -> tuple[pd.DataFrame, str]:
     if df.empty:
-        return df.copy(), "Resumo do Período"
+        return df, "Resumo do Período"
 
     data_col = "data_fim" if "data_fim" in df.columns else "data"
-    work = df.copy()
-    work = work.dropna(subset=[data_col])
+    work = df.dropna(subset=[data_col])
     if work.empty:
         return work, "Resumo do Período"
 
     titulo = "Resumo do Mês"
     if modo_periodo == "Mensal":
+        hoje = pd.Timestamp.today()
         col1, col2 = st.columns(2)
         with col1:
-            ano = st.number_input("Ano", min_value=2020, max_value=2100, value=pd.Timestamp.today().year, key="inv_ano")
+            ano = st.number_input("Ano", min_value=2020, max_value=2100, value=hoje.year, key="inv_ano")
         with col2:
-            mes = st.number_input("Mês", min_value=1, max_value=12, value=pd.Timestamp.today().month, key="inv_mes")
-        work = work[(work[data_col].dt.year == int(ano)) & (work[data_col].dt.month == int(mes))]
-        return work, titulo
+            mes = st.number_input("Mês", min_value=1, max_value=12, value=hoje.month, key="inv_mes")
+        inicio_mes = pd.Timestamp(year=int(ano), month=int(mes), day=1)
+        return fatiar_periodo(work, data_col, inicio_mes, inicio_mes + pd.offsets.MonthBegin(1)), titulo
 
     min_data = work[data_col].min().date()
     max_data = work[data_col].max().date()
@@ -140,9 +133,23 @@ def _filter_period(df: pd.DataFrame, modo_periodo: str) -> tuple[pd.DataFrame, s
     if pd.to_datetime(data_inicial) > pd.to_datetime(data_final):
         st.warning("A data inicial não pode ser maior que a data final.")
         return pd.DataFrame(columns=work.columns), "Resumo do Período"
-    inicio = pd.to_datetime(data_inicial)
-    fim = pd.to_datetime(data_final) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-    return work[(work[data_col] >= inicio) & (work[data_col] <= fim)], "Resumo do Período"
+    fim_exclusivo = pd.to_datetime(data_final) + pd.Timedelta(days=1)
+    return fatiar_periodo(work, data_col, pd.to_datetime(data_inicial), fim_exclusivo), "Resumo do Período"
+
+
+@cache_data(max_entries=16, show_spinner=False)
+def _resumo_carteira(df: pd.DataFrame) -> dict[str, float]:
+    """Portfolio KPIs for one set of movements; reruns with the same frame hit the cache."""
+
+    analytics_df = _analytics_frame(df)
+    return {
+        "patrimonio": float(analytics_patrimonio_atual(analytics_df)),
+        "aportado": float(total_aportado(analytics_df)),
+        "lucro": float(lucro_acumulado(analytics_df)),
+        "rentabilidade": float(rentabilidade_percentual(analytics_df)),
+        "cagr": float(calcular_cagr(analytics_df)),
+        "patrimonio_inicial": float(patrimonio_inicial(analytics_df)),
+    }
 
 
 def _render_summary(df: pd.DataFrame) -> None:
@@ -151,22 +158,15 @@ def _render_summary(df: pd.DataFrame) -> None:
         show_empty_data("Sem investimentos no período selecionado.")
         return
 
-    analytics_df = _analytics_frame(df)
-    patrimonio = float(analytics_patrimonio_atual(analytics_df))
-    aportado = float(total_aportado(analytics_df))
-    lucro = float(lucro_acumulado(analytics_df))
-    rent_pct = float(rentabilidade_percentual(analytics_df))
-    cagr = float(calcular_cagr(analytics_df))
-    patrimonio_base = float(patrimonio_inicial(analytics_df))
-
+    resumo = _resumo_carteira(df)
     render_kpi_grid(
         [
-            ("Patrimônio atual", format_currency(patrimonio), None),
-            ("Total aportado", format_currency(aportado), None),
-            ("Lucro acumulado", format_currency(lucro), None),
-            ("Rentabilidade", format_percent(rent_pct), None),
-            ("CAGR", format_percent(cagr), "Baseado no patrimônio inicial/final"),
-            ("Patrimônio inicial", format_currency(patrimonio_base), None),
+            ("Patrimônio atual", format_currency(resumo["patrimonio"]), None),
+            ("Total aportado", format_currency(resumo["aportado"]), None),
+            ("Lucro acumulado", format_currency(resumo["lucro"]), None),
+            ("Rentabilidade", format_percent(resumo["rentabilidade"]), None),
+            ("CAGR", format_percent(resumo["cagr"]), "Baseado no patrimônio inicial/final"),
+            ("Patrimônio inicial", format_currency(resumo["patrimonio_inicial"]), None),
         ]
     )
 
@@ -178,45 +178,89 @@ def _render_charts(df: pd.DataFrame) -> None:
         return
 
     data_col = "data_fim" if "data_fim" in df.columns else "data"
-    work = df.copy().dropna(subset=[data_col])
+    work = df.dropna(subset=[data_col])
     if work.empty:
         show_empty_data("Sem datas válidas para gráficos.")
         return
 
-    work = work.sort_values(by=[data_col, "id"] if "id" in work.columns else [data_col], ascending=True)
-    work["tipo_label"] = work["tipo_movimentacao"].map(TIPO_MOVIMENTACAO_LABELS).fillna("Movimentação")
-    work["patrimonio total"] = pd.to_numeric(work["patrimonio total"], errors="coerce").fillna(0.0)
-    work["rendimento"] = pd.to_numeric(work["rendimento"], errors="coerce").fillna(0.0)
-    work["aporte_abs"] = work["aporte"].abs()
-
+    fig_pat, fig_comp = _figuras_carteira(work, data_col)
     col1, col2 = st.columns(2)
     with col1:
-        serie = work[[data_col, "patrimonio total"]].dropna().groupby(data_col, as_index=False).last()
-        fig_pat = px.line(serie, x=data_col, y="patrimonio total", markers=True, labels={data_col: "Data", "patrimonio total": "Patrimônio"})
         st.plotly_chart(fig_pat, use_container_width=True)
     with col2:
+        st.plotly_chart(fig_comp, use_container_width=True)
+
+
+@cache_data(max_entries=16, show_spinner=False)
+def _figuras_carteira(work: pd.DataFrame, data_col: str) -> tuple[go.Figure, go.Figure]:
+    """Patrimony line and composition bar, rebuilt only when the filtered movements change."""
+
+    work = work.sort_values(by=[data_col, "id"] if "id" in work.columns else [data_col], ascending=True)
+    work["tipo_label"] = work["tipo_movimentacao"].map(TIPO_MOVIMENTACAO_LABELS).fillna("Movimentação")
+    work["aporte_abs"] = work["aporte"].abs()
+
+    # work is sorted by (date, id), so the last row per date is the day's closing patrimony.
+    serie = work.drop_duplicates(subset=data_col, keep="last")[[data_col, "patrimonio total"]]
+    fig_pat = px.line(serie, x=data_col, y="patrimonio total", markers=True, labels={data_col: "Data", "patrimonio total": "Patrimônio"})
+
+    composicao = (
+        work.groupby(["categoria", "tipo_label"], as_index=False, observed=True)["aporte_abs"]
+        .sum()
+        .rename(columns={"aporte_abs": "valor"})
+    )
+    if composicao["valor"].sum() <= 0:
         composicao = (
-            work.groupby(["categoria", "tipo_label"], as_index=False)["aporte_abs"]
+            work.groupby("categoria", as_index=False, observed=True)["rendimento"]
             .sum()
-            .rename(columns={"aporte_abs": "valor"})
+            .rename(columns={"rendimento": "valor"})
         )
-        if composicao["valor"].sum() <= 0:
-            composicao = work.groupby("categoria", as_index=False)["rendimento"].sum().rename(columns={"rendimento": "valor"})
-            fig_comp = px.bar(
-                composicao,
-                x="categoria",
-                y="valor",
-                labels={"categoria": "Categoria", "valor": "Valor"},
-            )
-        else:
-            fig_comp = px.bar(
-                composicao,
-                x="categoria",
-                y="valor",
-                color="tipo_label",
-                labels={"categoria": "Categoria", "valor": "Valor"},
-            )
-        st.plotly_chart(fig_comp, use_container_width=True)
+        fig_comp = px.bar(
+            composicao,
+            x="categoria",
+            y="valor",
+            labels={"categoria": "Categoria", "valor": "Valor"},
+        )
+    else:
+        fig_comp = px.bar(
+            composicao,
+            x="categoria",
+            y="valor",
+            color="tipo_label",
+            labels={"categoria": "Categoria", "valor": "Valor"},
+        )
+    return fig_pat, fig_comp
+
+
+@cache_data(max_entries=64, show_spinner=False)
+def _projecao_mensal(patrimonio_base: float, taxa_mensal: float, meses: int, aporte_mensal: float) -> pd.DataFrame:
+    """Month-by-month compound projection, memoized per parameter tuple."""
+
+    mes = np.arange(0, int(meses) + 1)
+    fator = np.power(1.0 + taxa_mensal, mes)
+    acumulado_aportes = aporte_mensal * ((fator - 1.0) / taxa_mensal) if taxa_mensal else aporte_mensal * mes
+    patrimonio = patrimonio_base * fator + acumulado_aportes
+    aportes_acumulados = aporte_mensal * mes.astype(float)
+    return pd.DataFrame(
+        {
+            "mes": mes,
+            "patrimonio": patrimonio,
+            "aportes_acumulados": aportes_acumulados,
+            "juros_acumulados": np.maximum(0.0, patrimonio - patrimonio_base - aportes_acumulados),
+        }
+    )
+
+
+@cache_data(max_entries=64, show_spinner=False)
+def _figura_projecao(patrimonio_base: float, taxa_mensal: float, meses: int, aporte_mensal: float) -> go.Figure:
+    """Projection chart for one parameter tuple, cached alongside its table."""
+
+    proj_df = _projecao_mensal(patrimonio_base, taxa_mensal, meses, aporte_mensal)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=proj_df["mes"], y=proj_df["patrimonio"], mode="lines+markers", name="Patrimônio total"))
+    fig.add_trace(go.Scatter(x=proj_df["mes"], y=proj_df["aportes_acumulados"], mode="lines", name="Aportes acumulados"))
+    fig.add_trace(go.Scatter(x=proj_df["mes"], y=proj_df["juros_acumulados"], mode="lines", name="Juros acumulados"))
+    fig.update_layout(xaxis_title="Mês", yaxis_title="Valor")
+    return fig
 
 
 def _render_projection(df: pd.DataFrame) -> None:
@@ -226,25 +270,21 @@ def _render_projection(df: pd.DataFrame) -> None:
         return
 
     analytics_df = _analytics_frame(df)
-    patrimonio_base = float(analytics_patrimonio_atual(analytics_df))
-    aportes = analytics_df.copy()
-    aportes["data_ref"] = pd.to_datetime(aportes.get("data_fim", aportes.get("data")), errors="coerce")
-    aportes = aportes.dropna(subset=["data_ref"])
-    aportes["aporte"] = pd.to_numeric(aportes["aporte"], errors="coerce").fillna(0.0)
+    patrimonio_base = _resumo_carteira(df)["patrimonio"]
+    aportes = analytics_df.assign(
+        data_ref=as_datetime(analytics_df.get("data_fim", analytics_df.get("data"))),
+        aporte=pd.to_numeric(analytics_df["aporte"], errors="coerce").fillna(0.0),
+    ).dropna(subset=["data_ref"])
     if "tipo_movimentacao" in aportes.columns:
-        aportes["tipo_movimentacao"] = aportes["tipo_movimentacao"].fillna("").astype(str).str.upper().str.strip()
-        aportes = aportes[aportes["tipo_movimentacao"] == "APORTE"].copy()
+        aportes = aportes[aportes["tipo_movimentacao"].fillna("").astype(str).str.upper().str.strip() == "APORTE"]
     else:
-        aportes = aportes[aportes["aporte"] > 0].copy()
+        aportes = aportes[aportes["aporte"] > 0]
 
     media_aportes = 0.0
     if not aportes.empty:
-        mensal = (
-            aportes.assign(mes=aportes["data_ref"].dt.to_period("M").astype(str))
-            .groupby("mes", as_index=False)["aporte"]
-            .sum()
-        )
-        media_aportes = float(mensal["aporte"].mean()) if not mensal.empty else 0.0
+        meses_ref = aportes["data_ref"].to_numpy().astype("datetime64[M]")
+        _, mes_idx = np.unique(meses_ref, return_inverse=True)
+        media_aportes = float(np.bincount(mes_idx, weights=aportes["aporte"].to_numpy(dtype=float)).mean())
 
     sim_auto, sim_custom = st.tabs(["Simulador da Carteira", "Simulador Personalizado"])
 
@@ -260,7 +300,8 @@ def _render_projection(df: pd.DataFrame) -> None:
         meses = int(anos) * 12 + int(meses_extra)
         taxa_anual = float(taxa_anual_pct) / 100.0
         taxa_mensal = (1.0 + taxa_anual) ** (1.0 / 12.0) - 1.0 if taxa_anual > 0 else 0.0
-        valor_projetado = float(projecao_com_aporte(analytics_df, taxa_mensal, int(meses), float(media_aportes)))
+        proj_df = _projecao_mensal(patrimonio_base, taxa_mensal, int(meses), float(media_aportes))
+        valor_projetado = float(proj_df["patrimonio"].iloc[-1])
         ganho_proj = float(valor_projetado - patrimonio_base)
 
         render_kpi_grid(
@@ -271,25 +312,7 @@ def _render_projection(df: pd.DataFrame) -> None:
             ]
         )
 
-        valores = []
-        for mes in range(0, int(meses) + 1):
-            patrimonio_mes = float(projecao_com_aporte(analytics_df, taxa_mensal, mes, float(media_aportes)))
-            aportes_mes = float(media_aportes) * int(mes)
-            juros_mes = float(max(0.0, patrimonio_mes - patrimonio_base - aportes_mes))
-            valores.append(
-                {
-                    "mes": mes,
-                    "patrimonio": patrimonio_mes,
-                    "aportes_acumulados": float(aportes_mes),
-                    "juros_acumulados": float(juros_mes),
-                }
-            )
-        proj_df = pd.DataFrame(valores)
-        fig_proj = go.Figure()
-        fig_proj.add_trace(go.Scatter(x=proj_df["mes"], y=proj_df["patrimonio"], mode="lines+markers", name="Patrimônio total"))
-        fig_proj.add_trace(go.Scatter(x=proj_df["mes"], y=proj_df["aportes_acumulados"], mode="lines", name="Aportes acumulados"))
-        fig_proj.add_trace(go.Scatter(x=proj_df["mes"], y=proj_df["juros_acumulados"], mode="lines", name="Juros acumulados"))
-        fig_proj.update_layout(xaxis_title="Mês", yaxis_title="Valor")
+        fig_proj = _figura_projecao(patrimonio_base, taxa_mensal, int(meses), float(media_aportes))
         st.plotly_chart(fig_proj, use_container_width=True, key="inv_proj_auto_chart")
         cruzamento_auto = proj_df[proj_df["juros_acumulados"] >= proj_df["aportes_acumulados"]]
         if not cruzamento_auto.empty:
@@ -317,7 +340,8 @@ def _render_projection(df: pd.DataFrame) -> None:
         meses_custom = int(anos_custom) * 12 + int(meses_custom_extra)
         taxa_custom_anual = float(taxa_custom_pct) / 100.0
         taxa_custom_mensal = (1.0 + taxa_custom_anual) ** (1.0 / 12.0) - 1.0 if taxa_custom_anual > 0 else 0.0
-        valor_custom = float(projecao_com_aporte(analytics_df, taxa_custom_mensal, int(meses_custom), float(aporte_custom)))
+        proj_custom_df = _projecao_mensal(patrimonio_base, taxa_custom_mensal, int(meses_custom), float(aporte_custom))
+        valor_custom = float(proj_custom_df["patrimonio"].iloc[-1])
         ganho_custom = float(valor_custom - patrimonio_base)
 
         render_kpi_grid(
@@ -328,25 +352,7 @@ def _render_projection(df: pd.DataFrame) -> None:
             ]
         )
 
-        valores_custom = []
-        for mes in range(0, int(meses_custom) + 1):
-            patrimonio_mes = float(projecao_com_aporte(analytics_df, taxa_custom_mensal, mes, float(aporte_custom)))
-            aportes_mes = float(aporte_custom) * int(mes)
-            juros_mes = float(max(0.0, patrimonio_mes - patrimonio_base - aportes_mes))
-            valores_custom.append(
-                {
-                    "mes": mes,
-                    "patrimonio": patrimonio_mes,
-                    "aportes_acumulados": float(aportes_mes),
-                    "juros_acumulados": float(juros_mes),
-                }
-            )
-        proj_custom_df = pd.DataFrame(valores_custom)
-        fig_custom = go.Figure()
-        fig_custom.add_trace(go.Scatter(x=proj_custom_df["mes"], y=proj_custom_df["patrimonio"], mode="lines+markers", name="Patrimônio total"))
-        fig_custom.add_trace(go.Scatter(x=proj_custom_df["mes"], y=proj_custom_df["aportes_acumulados"], mode="lines", name="Aportes acumulados"))
-        fig_custom.add_trace(go.Scatter(x=proj_custom_df["mes"], y=proj_custom_df["juros_acumulados"], mode="lines", name="Juros acumulados"))
-        fig_custom.update_layout(xaxis_title="Mês", yaxis_title="Valor")
+        fig_custom = _figura_projecao(patrimonio_base, taxa_custom_mensal, int(meses_custom), float(aporte_custom))
         st.plotly_chart(fig_custom, use_container_width=True, key="inv_proj_custom_chart")
         cruzamento_custom = proj_custom_df[proj_custom_df["juros_acumulados"] >= proj_custom_df["aportes_acumulados"]]
         if not cruzamento_custom.empty:
@@ -360,19 +366,17 @@ def _render_projection(df: pd.DataFrame) -> None:
 def _render_forms(df_investimentos: pd.DataFrame) -> None:
     titulo_secao("Gestão de Investimentos")
 
-    categorias_invest = INVEST_CATEGORIAS.copy()
-    for key in ["cad_inv_aporte_categoria", "cad_inv_rend_categoria", "cad_inv_ret_categoria"]:
-        cat = str(st.session_state.get(key, "")).strip()
-        if cat and cat not in categorias_invest:
-            categorias_invest.append(cat)
-    for cat in sorted(df_investimentos["categoria"].dropna().astype(str).unique().tolist()) if not df_investimentos.empty else []:
-        if cat and cat not in categorias_invest:
-            categorias_invest.append(cat)
+    # Fixed categories first, then ones typed in the forms, then any others found in the data (first occurrence wins).
+    form_keys = ["cad_inv_aporte_categoria", "cad_inv_rend_categoria", "cad_inv_ret_categoria"]
+    extras = [str(st.session_state.get(key, "")).strip() for key in form_keys]
+    if not df_investimentos.empty:
+        extras.extend(sorted(df_investimentos["categoria"].dropna().astype(str).unique().tolist()))
+    categorias_invest = list(dict.fromkeys([*INVEST_CATEGORIAS, *(cat for cat in extras if cat)]))
 
     df_investimentos = _sort_desc_by_id(df_investimentos)
-    df_aportes = _sort_desc_by_id(df_investimentos[df_investimentos["tipo_movimentacao"] == "APORTE"].copy()) if not df_investimentos.empty else pd.DataFrame()
-    df_rendimentos = _sort_desc_by_id(df_investimentos[df_investimentos["tipo_movimentacao"] == "RENDIMENTO"].copy()) if not df_investimentos.empty else pd.DataFrame()
-    df_retiradas = _sort_desc_by_id(df_investimentos[df_investimentos["tipo_movimentacao"] == "RETIRADA"].copy()) if not df_investimentos.empty else pd.DataFrame()
+    df_aportes = _sort_desc_by_id(df_investimentos[df_investimentos["tipo_movimentacao"] == "APORTE"]) if not df_investimentos.empty else pd.DataFrame()
+    df_rendimentos = _sort_desc_by_id(df_investimentos[df_investimentos["tipo_movimentacao"] == "RENDIMENTO"]) if not df_investimentos.empty else pd.DataFrame()
+    df_retiradas = _sort_desc_by_id(df_investimentos[df_investimentos["tipo_movimentacao"] == "RETIRADA"]) if not df_investimentos.empty else pd.DataFrame()
     patrimonio_atual = _patrimonio_atual(df_investimentos)
 
     tab_aporte, tab_rendimento, tab_retirada = st.tabs(["Aportes", "Rendimentos", "Retiradas"])
@@ -436,6 +440,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                             "inv_aporte_rendimento_zero",
                             "inv_aporte_patrimonio_preview",
                         ])
+                        limpar_cache_dados()
                         st.rerun()
 
                 if atualizar:
@@ -457,6 +462,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                             tipo_movimentacao="APORTE",
                         )
                         st.success("Aporte atualizado com sucesso.")
+                        limpar_cache_dados()
                         st.rerun()
 
                 if excluir:
@@ -468,6 +474,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                         service.deletar_investimento(int(selected_id))
                         st.success("Aporte excluído com sucesso.")
                         _reset_fields(["cad_inv_aporte_selected_id", "cad_inv_aporte_last_selected_id", "cad_inv_aporte_confirmar_exclusao"])
+                        limpar_cache_dados()
                         st.rerun()
             except ValueError as exc:
                 st.warning(str(exc))
@@ -544,6 +551,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                             "inv_rend_patrimonio_preview",
                             "cad_inv_rend_categoria",
                         ])
+                        limpar_cache_dados()
                         st.rerun()
 
                 if atualizar:
@@ -567,6 +575,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                             tipo_movimentacao="RENDIMENTO",
                         )
                         st.success("Rendimento atualizado com sucesso.")
+                        limpar_cache_dados()
                         st.rerun()
 
                 if excluir:
@@ -578,6 +587,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                         service.deletar_investimento(int(selected_id))
                         st.success("Rendimento excluído com sucesso.")
                         _reset_fields(["cad_inv_rend_selected_id", "cad_inv_rend_last_selected_id", "cad_inv_rend_confirmar_exclusao"])
+                        limpar_cache_dados()
                         st.rerun()
             except ValueError as exc:
                 st.warning(str(exc))
@@ -648,6 +658,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                             "inv_ret_rendimento_zero",
                             "inv_ret_patrimonio_preview",
                         ])
+                        limpar_cache_dados()
                         st.rerun()
 
                 if atualizar:
@@ -671,6 +682,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                             tipo_movimentacao="RETIRADA",
                         )
                         st.success("Retirada atualizada com sucesso.")
+                        limpar_cache_dados()
                         st.rerun()
 
                 if excluir:
@@ -682,6 +694,7 @@ def _render_forms(df_investimentos: pd.DataFrame) -> None:
                         service.deletar_investimento(int(selected_id))
                         st.success("Retirada excluída com sucesso.")
                         _reset_fields(["cad_inv_ret_selected_id", "cad_inv_ret_last_selected_id", "cad_inv_ret_confirmar_exclusao"])
+                        limpar_cache_dados()
                         st.rerun()
             except ValueError as exc:
                 st.warning(str(exc))
@@ -698,10 +711,10 @@ def _render_table(df: pd.DataFrame) -> None:
     tabela = _with_display_order(df)
     for col in ["data", "data_inicio", "data_fim"]:
         if col in tabela.columns:
-            tabela[col] = pd.to_datetime(tabela[col], errors="coerce").dt.date
-    for col in ["aporte", "total aportado", "rendimento", "patrimonio total"]:
-        if col in tabela.columns:
-            tabela[col] = pd.to_numeric(tabela[col], errors="coerce").fillna(0.0).apply(formatar_moeda)
+            tabela[col] = as_datetime(tabela[col]).dt.date
+    tabela = tabela.assign(
+        **{col: formatar_moeda_series(tabela[col]) for col in _INVEST_NUMERIC_COLUMNS if col in tabela.columns}
+    )
     if "tipo_movimentacao" in tabela.columns:
         tabela["tipo_movimentacao"] = tabela["tipo_movimentacao"].map(TIPO_MOVIMENTACAO_LABELS).fillna("Movimentação")
     st.dataframe(tabela, use_container_width=True, hide_index=True)
@@ -710,7 +723,8 @@ def _render_table(df: pd.DataFrame) -> None:
 def pagina_investimentos() -> None:
     st.header("Investimentos")
 
-    df_investimentos = _prepare_investimentos(service.listar_investimentos())
+    render_refresh_button("inv_refresh_data")
+    df_investimentos = _prepare_investimentos(carregar_dados("investimentos"))
     modo_periodo = st.radio("Visualização", ["Mensal", "Personalizado"], horizontal=True, key="inv_modo_periodo")
     df_filtrado, titulo = _filter_period(df_investimentos, modo_periodo)
 
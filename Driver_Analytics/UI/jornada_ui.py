@@ -10,6 +10,7 @@ import streamlit as st
 
 from UI.cadastros_ui import _ensure_selected_option, _reset_fields
 from UI.components import render_kpi_grid, show_empty_data, titulo_secao
+from UI.data_cache import limpar_cache_dados
 from services.work_day_messages import work_day_bootstrap_message
 from services.work_day_service import WorkDayService
 
@@ -266,6 +267,7 @@ def _render_auto_flow(open_day: dict | None) -> None:
                 try:
                     service.iniciar_jornada(start_km=start_km, notes=notes)
                     st.success("Jornada iniciada.")
+                    limpar_cache_dados()
                     st.rerun()
                 except Exception as exc:
                     st.error(str(exc))
@@ -280,6 +282,7 @@ def _render_auto_flow(open_day: dict | None) -> None:
                 try:
                     service.encerrar_jornada(end_km=end_km, notes=notes)
                     st.success("Jornada encerrada.")
+                    limpar_cache_dados()
                     st.rerun()
                 except Exception as exc:
                     st.error(str(exc))
@@ -345,6 +348,7 @@ def _render_manual_create() -> None:
                         allow_manual_override=allow_override,
                     )
                     st.success("Jornada manual registrada.")
+                    limpar_cache_dados()
                     st.rerun()
                 except Exception as exc:
                     st.error(str(exc))
@@ -446,6 +450,7 @@ def _render_manual_edit(jornadas: list[dict]) -> None:
                 else:
                     service.editar_jornada(int(selected_id), payload, allow_manual_override=allow_override, notes=notes)
                 st.success("Jornada atualizada.")
+                limpar_cache_dados()
                 st.rerun()
             except Exception as exc:
                 st.error(str(exc))
@@ -454,6 +459,7 @@ def _render_manual_edit(jornadas: list[dict]) -> None:
                 service.deletar_jornada(int(selected_id))
                 st.success("Jornada excluída.")
                 _reset_fields(["wd_edit_selected_id", "wd_edit_last_selected_id"])
+                limpar_cache_dados()
                 st.rerun()
             except Exception as exc:
                 st.error(str(exc))
@@ -516,6 +522,7 @@ def _render_km_control() -> None:
             if salvar:
                 service.criar_km_periodo(start_date.isoformat(), end_date.isoformat(), km_total, notes=notes)
                 st.success("Período salvo.")
+                limpar_cache_dados()
                 st.rerun()
             if atualizar:
                 if selected is None:
@@ -523,6 +530,7 @@ def _render_km_control() -> None:
                 else:
                     service.atualizar_km_periodo(int(selected["id"]), start_date.isoformat(), end_date.isoformat(), km_total, notes=notes)
                     st.success("Período atualizado.")
+                    limpar_cache_dados()
                     st.rerun()
             if excluir:
                 if selected is None:
@@ -533,6 +541,7 @@ def _render_km_control() -> None:
                     service.deletar_km_periodo(int(selected["id"]))
                     st.success("Período excluído.")
                     _reset_fields(["wd_km_period_selected_id", "wd_km_period_last_selected_id"])
+                    limpar_cache_dados()
                     st.rerun()
         except Exception as exc:
             st.error(str(exc))
@@ -587,6 +596,7 @@ def _render_km_control() -> None:
                         f"{int(result['updated_rows'])} jornada(s) atualizada(s) usando a âncora "
                         f"ID {int(result['anchor_work_day_id'])} em {result['anchor_work_date']}."
                     )
+                    limpar_cache_dados()
                     st.rerun()
             except Exception as exc:
                 st.error(str(exc))
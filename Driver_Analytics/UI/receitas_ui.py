@@ -5,46 +5,70 @@ from __future__ import annotations
 import pandas as pd
 import streamlit as st
 
-from services.dashboard_service import DashboardService
+from core.auth import get_logged_user_id
+from core.config import cache_data
+from services.dashboard_service import get_dashboard_service
 from UI.cadastros_ui import _with_display_order, render_receitas_cadastro
-from UI.components import format_currency, format_percent, formatar_moeda, render_kpi_grid, show_empty_data, titulo_secao
-
-
-service = DashboardService()
-
-
-def _format_hms(total_seconds: float) -> str:
-    seconds = int(total_seconds)
-    horas = seconds // 3600
-    minutos = (seconds % 3600) // 60
-    segundos = seconds % 60
-    return f"{horas:02d}:{minutos:02d}:{segundos:02d}"
+from UI.components import format_currency, format_percent, formatar_moeda_series, render_kpi_grid, show_empty_data, titulo_secao
+from UI.data_cache import (
+    CACHE_TTL_SECONDS,
+    as_datetime,
+    carregar_dados,
+    carregar_periodo,
+    fatiar_periodo,
+    render_refresh_button,
+    versao_dados,
+)
+
+
+service = get_dashboard_service()
+
+
+@cache_data(ttl=CACHE_TTL_SECONDS, max_entries=32, show_spinner=False)
+def _metricas_periodo(
+    user_id: int | None, inicio_iso: str | None, fim_iso: str | None, mensal: bool, daily_goal: float, versao: int
+) -> dict:
+    """Period KPIs and daily series from one aggregation, cached per user/window/goal and invalidated by data writes.
+
+    Rows come from the same cached read the page shows: the month query in Mensal, a slice of the table otherwise.
+    """
+
+    if inicio_iso is None or fim_iso is None:
+        return service.metrics.resumo_receitas(None, meta=daily_goal)
+    inicio, fim = pd.Timestamp(inicio_iso), pd.Timestamp(fim_iso)
+    if mensal:
+        df = carregar_periodo("receitas", inicio, fim)
+    else:
+        df = fatiar_periodo(carregar_dados("receitas"), "data", inicio, fim)
+    return service.metrics.resumo_receitas(df, meta=daily_goal)
 
 
 def pagina_receitas() -> None:
     st.header("Receitas")
 
-    df = service.listar_receitas()
+    render_refresh_button("rec_refresh_data")
     daily_goal = float(service.obter_daily_goal())
-    if "data" in df.columns:
-        df["data"] = pd.to_datetime(df["data"], errors="coerce")
-    if "tempo trabalhado" in df.columns:
-        df["tempo trabalhado"] = pd.to_numeric(df["tempo trabalhado"], errors="coerce").fillna(0).astype(int)
 
     modo_periodo = st.radio("Visualização", ["Mensal", "Personalizado"], horizontal=True, key="rec_modo_periodo")
 
-    df_filtrado = df.copy()
     titulo_resumo = "Resumo do Mês"
     if modo_periodo == "Mensal":
-        col1, col2 = st.columns(2)
-        with col1:
-            ano = st.number_input("Ano", min_value=2020, max_value=2100, value=pd.Timestamp.today().year, key="rec_ano")
-        with col2:
-            mes = st.number_input("Mês", min_value=1, max_value=12, value=pd.Timestamp.today().month, key="rec_mes")
-        if not df_filtrado.empty and "data" in df_filtrado.columns:
-            df_filtrado = df_filtrado[(df_filtrado["data"].dt.year == int(ano)) & (df_filtrado["data"].dt.month == int(mes))]
+        hoje = pd.Timestamp.today()
+        # Inside a form the inputs only change the page on "Aplicar"; other reruns keep the last applied month.
+        with st.form("rec_filtro_mes"):
+            col1, col2 = st.columns(2)
+            with col1:
+                ano = st.number_input("Ano", min_value=2020, max_value=2100, value=hoje.year, key="rec_ano")
+            with col2:
+                mes = st.number_input("Mês", min_value=1, max_value=12, value=hoje.month, key="rec_mes")
+            st.form_submit_button("Aplicar")
+        inicio = pd.Timestamp(year=int(ano), month=int(mes), day=1)
+        fim = inicio + pd.offsets.MonthBegin(1)
+        df_filtrado = carregar_periodo("receitas", inicio, fim)
     else:
         titulo_resumo = "Resumo do Período"
+        df = carregar_dados("receitas")
+        df_filtrado = df
         if df_filtrado.empty or "data" not in df_filtrado.columns or df_filtrado["data"].dropna().empty:
             show_empty_data("Sem dados para aplicar filtro personalizado.")
             df_filtrado = pd.DataFrame(columns=df.columns)
@@ -77,14 +101,18 @@ def pagina_receitas() -> None:
                 fim = None
             else:
                 inicio = pd.to_datetime(data_inicial)
-                fim = pd.to_datetime(data_final) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-                df_filtrado = df_filtrado[(df_filtrado["data"] >= inicio) & (df_filtrado["data"] <= fim)]
+                fim = pd.to_datetime(data_final) + pd.Timedelta(days=1)
+                df_filtrado = fatiar_periodo(df_filtrado, "data", inicio, fim)
 
     titulo_secao(titulo_resumo)
-    total = service.metrics.receita_total(df_filtrado)
-    media = service.metrics.receita_media_diaria(df_filtrado)
-    dias = service.metrics.dias_trabalhados(df_filtrado)
-    meta_pct = service.metrics.percentual_meta_batida(df_filtrado, meta=daily_goal)
+    resumo_periodo = _metricas_periodo(
+        get_logged_user_id(),
+        inicio.date().isoformat() if inicio is not None else None,
+        fim.date().isoformat() if fim is not None else None,
+        modo_periodo == "Mensal",
+        daily_goal,
+        versao_dados(),
+    )
 
     titulo_secao("Meta Diária")
     with st.form("receitas_daily_goal_form"):
@@ -100,107 +128,80 @@ def pagina_receitas() -> None:
 
     render_kpi_grid(
         [
-            ("Total", format_currency(total), None),
-            ("Média diária", format_currency(media), None),
-            ("Dias trabalhados", dias, None),
-            ("% Meta", format_percent(meta_pct), f"Meta diária: {format_currency(daily_goal)}"),
+            ("Total", format_currency(resumo_periodo["total"]), None),
+            ("Média diária", format_currency(resumo_periodo["media_diaria"]), None),
+            ("Dias trabalhados", resumo_periodo["dias_trabalhados"], None),
+            (
+                "% Meta",
+                format_percent(resumo_periodo["percentual_meta"]),
+                f"Meta diária: {format_currency(daily_goal)}",
+            ),
         ]
     )
 
     titulo_secao("Evolução Diária")
-    if not df_filtrado.empty and {"data", "valor"}.issubset(df_filtrado.columns):
-        resumo = df_filtrado.groupby("data")["valor"].sum()
-        st.line_chart(resumo)
+    if not resumo_periodo["diario"].empty:
+        st.line_chart(resumo_periodo["diario"])
     else:
         show_empty_data()
 
     titulo_secao("Evolução Semanal, Mensal e Anual")
-    if not df_filtrado.empty and {"data", "valor"}.issubset(df_filtrado.columns):
-        base = df_filtrado.copy()
-        base["valor"] = pd.to_numeric(base["valor"], errors="coerce").fillna(0.0)
-        base["data"] = pd.to_datetime(base["data"], errors="coerce")
-        base = base.dropna(subset=["data"])
-
-        if base.empty:
-            show_empty_data("Sem dados suficientes para evolução por período.")
-        else:
-            semanal = (
-                base.set_index("data")["valor"]
-                .resample("W-SUN")
-                .sum()
-                .rename_axis("periodo")
-            )
-            mensal = (
-                base.set_index("data")["valor"]
-                .resample("M")
-                .sum()
-                .rename_axis("periodo")
-            )
-            anual = (
-                base.set_index("data")["valor"]
-                .resample("Y")
-                .sum()
-                .rename_axis("periodo")
-            )
-
-            tab_sem, tab_men, tab_anu = st.tabs(["Semanal", "Mensal", "Anual"])
-            with tab_sem:
-                st.line_chart(semanal)
-            with tab_men:
-                st.line_chart(mensal)
-            with tab_anu:
-                st.line_chart(anual)
-    else:
+    diario = resumo_periodo["diario"]
+    if df_filtrado.empty or not {"data", "valor"}.issubset(df_filtrado.columns):
         show_empty_data("Sem dados para evolução semanal, mensal e anual.")
+    elif diario.empty:
+        show_empty_data("Sem dados suficientes para evolução por período.")
+    else:
+        # Re-bucket the cached daily totals instead of re-aggregating the raw rows.
+        semanal = diario.resample("W-SUN").sum().rename_axis("periodo")
+        mensal = diario.resample("ME").sum().rename_axis("periodo")
+        anual = diario.resample("YE").sum().rename_axis("periodo")
+
+        tab_sem, tab_men, tab_anu = st.tabs(["Semanal", "Mensal", "Anual"])
+        with tab_sem:
+            st.line_chart(semanal)
+        with tab_men:
+            st.line_chart(mensal)
+        with tab_anu:
+            st.line_chart(anual)
 
     titulo_secao("Registros")
-    df_tabela = _with_display_order(df_filtrado)
+    df_tabela = _with_display_order(df_filtrado.drop(columns=["km", "km_rodado_total", "tempo trabalhado"], errors="ignore"))
+    formatadas = {}
     if "data" in df_tabela.columns:
-        df_tabela["data"] = pd.to_datetime(df_tabela["data"], errors="coerce").dt.date
+        formatadas["data"] = as_datetime(df_tabela["data"]).dt.date
     if "valor" in df_tabela.columns:
-        df_tabela["valor"] = pd.to_numeric(df_tabela["valor"], errors="coerce").fillna(0.0).apply(formatar_moeda)
-    for drop_col in ["km", "km_rodado_total", "tempo trabalhado"]:
-        if drop_col in df_tabela.columns:
-            df_tabela = df_tabela.drop(columns=[drop_col])
-    st.dataframe(df_tabela, use_container_width=True, hide_index=True)
+        formatadas["valor"] = formatar_moeda_series(df_tabela["valor"])
+    st.dataframe(df_tabela.assign(**formatadas), use_container_width=True, hide_index=True)
 
     titulo_secao("Remuneração (CPF)")
     st.caption(
         "Remuneração bruta = lucro do negócio no período (receitas - despesas de negócio). "
         "Remuneração disponível considera aportes e retiradas de investimentos."
     )
-    df_despesas = service.listar_despesas()
-    if "data" in df_despesas.columns:
-        df_despesas["data"] = pd.to_datetime(df_despesas["data"], errors="coerce")
-    if "esfera_despesa" not in df_despesas.columns:
-        df_despesas["esfera_despesa"] = "NEGOCIO"
-    df_despesas["esfera_despesa"] = df_despesas["esfera_despesa"].fillna("NEGOCIO").astype(str).str.upper().str.strip()
-
-    if modo_periodo == "Mensal":
-        despesas_filtradas = df_despesas[
-            (df_despesas["data"].dt.year == int(ano)) & (df_despesas["data"].dt.month == int(mes))
-        ].copy() if not df_despesas.empty else pd.DataFrame()
-    else:
-        despesas_filtradas = (
-            df_despesas[(df_despesas["data"] >= inicio) & (df_despesas["data"] <= fim)].copy()
-            if not df_despesas.empty and inicio is not None and fim is not None
-            else pd.DataFrame()
-        )
-
-    if "esfera_despesa" not in despesas_filtradas.columns:
-        despesas_filtradas["esfera_despesa"] = "NEGOCIO"
+    df_despesas = carregar_dados("despesas")
+    despesas_filtradas = (
+        fatiar_periodo(df_despesas, "data", inicio, fim)
+        if not df_despesas.empty and inicio is not None and fim is not None
+        else pd.DataFrame()
+    )
+    # assign() returns a new frame, so the cached table and its slices are never written to.
+    esfera = despesas_filtradas.get("esfera_despesa", pd.Series("NEGOCIO", index=despesas_filtradas.index))
+    despesas_filtradas = despesas_filtradas.assign(
+        esfera_despesa=esfera.fillna("NEGOCIO").astype(str).str.upper().str.strip()
+    )
 
-    despesas_negocio = despesas_filtradas[despesas_filtradas["esfera_despesa"] == "NEGOCIO"].copy()
-    despesas_pessoais = despesas_filtradas[despesas_filtradas["esfera_despesa"] == "PESSOAL"].copy()
+    despesas_negocio = despesas_filtradas[despesas_filtradas["esfera_despesa"] == "NEGOCIO"]
+    despesas_pessoais = despesas_filtradas[despesas_filtradas["esfera_despesa"] == "PESSOAL"]
 
-    df_inv = service.listar_investimentos()
+    df_inv = carregar_dados("investimentos")
     if not df_inv.empty:
         data_inv_col = "data_fim" if "data_fim" in df_inv.columns else "data"
-        df_inv[data_inv_col] = pd.to_datetime(df_inv[data_inv_col], errors="coerce")
-        if modo_periodo == "Mensal":
-            df_inv = df_inv[(df_inv[data_inv_col].dt.year == int(ano)) & (df_inv[data_inv_col].dt.month == int(mes))]
-        else:
-            df_inv = df_inv[(df_inv[data_inv_col] >= inicio) & (df_inv[data_inv_col] <= fim)] if inicio is not None and fim is not None else pd.DataFrame()
+        df_inv = (
+            fatiar_periodo(df_inv, data_inv_col, inicio, fim).copy()
+            if inicio is not None and fim is not None
+            else pd.DataFrame()
+        )
         df_inv["aporte"] = pd.to_numeric(df_inv.get("aporte"), errors="coerce").fillna(0.0)
         df_inv["tipo_movimentacao"] = df_inv.get("tipo_movimentacao", pd.Series(dtype="object")).fillna("").astype(str).str.upper().str.strip()
         df_inv.loc[df_inv["tipo_movimentacao"] == "", "tipo_movimentacao"] = df_inv["aporte"].map(
@@ -209,9 +210,10 @@ def pagina_receitas() -> None:
 
     despesa_negocio_total = service.metrics.despesa_total(despesas_negocio)
     despesa_pessoal_total = service.metrics.despesa_total(despesas_pessoais)
-    lucro_negocio = float(total - despesa_negocio_total)
-    aportes = float(df_inv[df_inv["tipo_movimentacao"] == "APORTE"]["aporte"].sum()) if not df_inv.empty else 0.0
-    retiradas = float(df_inv[df_inv["tipo_movimentacao"] == "RETIRADA"]["aporte"].sum()) if not df_inv.empty else 0.0
+    lucro_negocio = float(resumo_periodo["total"] - despesa_negocio_total)
+    totais_mov = df_inv.groupby("tipo_movimentacao")["aporte"].sum().to_dict() if not df_inv.empty else {}
+    aportes = float(totais_mov.get("APORTE", 0.0))
+    retiradas = float(totais_mov.get("RETIRADA", 0.0))
     remuneracao_disponivel = float(lucro_negocio - aportes + retiradas)
     saldo_cpf = float(remuneracao_disponivel - despesa_pessoal_total)
 
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import pandas as pd
 import streamlit as st
 
 from core.auth import get_logged_user_id, get_logged_username, login_required, render_logout_button
 from core.build_info import get_build_id
 from core.config import get_settings
 from core.database import get_supabase_client_status
-from UI.components import aplicar_estilo_global, render_hero_banner
+from UI.components import aplicar_estilo_global, render_page_header
 
 
+if int(pd.__version__.split(".")[0]) < 3:
+    # pandas 3 always copies on write; on 2.x opt in so slices and assign() share unchanged columns.
+    pd.set_option("mode.copy_on_write", True)
+
 st.set_page_config(page_title="Driver Analytics", page_icon="🚗", layout="wide")
-aplicar_estilo_global()
+page_header = st.empty()
+aplicar_estilo_global(page_header)
 
 login_required()
 
@@ -38,7 +44,7 @@ st.sidebar.caption(f"build {get_build_id()}")
 render_logout_button()
 
 menu = st.sidebar.radio("Navegação", ["Dashboard", "Jornada", "Receitas", "Despesas", "Investimentos", "Backup"])
-render_hero_banner(username, menu)
+render_page_header(username, menu, page_header)
 
 if menu == "Backup":
     st.sidebar.success("Exporte e restaure seus dados com segurança")
@@ -6,8 +6,10 @@ import base64
 import hashlib
 import hmac
 import json
+import re
 import secrets
 import uuid
+import weakref
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
@@ -26,6 +28,21 @@ _AUTH_COOKIE_NAME = "driver_analytics_session"
 _AUTH_COOKIE_SYNC_KEY = "_auth_cookie_sync_value"
 _AUTH_COOKIE_APPLIED_KEY = "_auth_cookie_applied_value"
 _AUTH_RATE_LIMIT_TABLE = "auth_rate_limits"
+# Once these rows are seen, login-page reruns stop looking them up again (the app never deletes users).
+_DEFAULT_ADMIN_PRESENT = False
+_NON_ADMIN_USER_PRESENT = False
+_SESSION_TOUCH_INTERVAL = timedelta(minutes=5)
+_NON_DIGITS = re.compile(r"\D")
+_SESSION_DEFAULTS: dict[str, Any] = {
+    "authenticated": False,
+    "current_user": "",
+    "current_user_id": None,
+    "session_id": "",
+    "session_token": "",
+    "must_change_password": False,
+}
+# Clients whose auth tables already answered a probe; the client is process-cached, so this skips 2 queries per rerun.
+_AUTH_SCHEMA_VERIFIED: weakref.WeakSet[Any] = weakref.WeakSet()
 
 
 def _utc_now() -> datetime:
@@ -50,7 +67,7 @@ def _normalize_username(value: str) -> str:
 
 
 def _normalize_cpf(value: str) -> str:
-    return "".join([c for c in str(value) if c.isdigit()])
+    return _NON_DIGITS.sub("", str(value))
 
 
 def _safe_iso_date(value: Any) -> str:
@@ -227,6 +244,11 @@ def _check_remote_auth_schema() -> tuple[bool, str]:
     client, client_detail = get_supabase_client_status()
     if not client:
         return False, f"Autenticação remota indisponível. {client_detail or 'Verifique SUPABASE_URL/SUPABASE_KEY e APP_DB_MODE=remote.'}"
+    try:
+        if client in _AUTH_SCHEMA_VERIFIED:
+            return True, ""
+    except TypeError:
+        pass
     try:
         client.table("usuarios").select("id").limit(1).execute()
     except Exception as exc:
@@ -249,6 +271,10 @@ def _check_remote_auth_schema() -> tuple[bool, str]:
             "Tabela remota `public.auth_sessions` indisponível para sessões. "
             f"Aplique as migrations SQL no Supabase.{hint} Detalhe: {_format_supabase_error(exc)}",
         )
+    try:
+        _AUTH_SCHEMA_VERIFIED.add(client)
+    except TypeError:
+        pass
     return True, ""
 
 
@@ -385,16 +411,21 @@ def _set_remote_rate_limit(action: str, key: str, failures: int, blocked_until:
         return
 
 
-def _rate_limited(action: str, key: str) -> bool:
-    _, blocked_until = _get_rate_limit(action, key)
-    return bool(blocked_until and blocked_until > _utc_now())
+def _rate_limit_status(action: str, key: str) -> tuple[int, bool]:
+    """Current failure count and whether the key is blocked; a zero count lets success skip its reset write."""
+
+    failures, blocked_until = _get_rate_limit(action, key)
+    return failures, bool(blocked_until and blocked_until > _utc_now())
 
 
-def _rate_limit_success(action: str, key: str) -> None:
+def _rate_limit_success(action: str, key: str, failures: int | None = None) -> None:
+    if failures == 0:
+        return
     _set_rate_limit(action, key, 0, None)
 
 
 def _rate_limit_failure(action: str, key: str, max_failures: int = 10, cooldown_minutes: int = 15) -> None:
+    # Always re-read: a count checked before the password verification may be stale under parallel attempts.
     failures, _ = _get_rate_limit(action, key)
     failures += 1
     blocked_until = None
@@ -455,13 +486,29 @@ def _create_session(user: dict[str, Any]) -> tuple[str, str] | None:
     return _supabase_create_session(user_id, raw_token)
 
 
+def _session_touch_due(last_seen_at: Any) -> bool:
+    """True once last_seen_at is 5+ minutes old: a write throttle far finer than the session_rotation_hours window."""
+
+    try:
+        return (_utc_now() - datetime.fromisoformat(str(last_seen_at or ""))) >= _SESSION_TOUCH_INTERVAL
+    except Exception:
+        return True
+
+
 def _supabase_resolve_session(session_id: str, raw_token: str) -> dict[str, Any] | None:
     client = get_supabase_client()
     if not client:
         _set_auth_error("Cliente Supabase indisponível para validar sessão.")
         return None
     try:
-        rows = client.table("auth_sessions").select("*").eq("session_id", str(session_id)).limit(1).execute().data
+        rows = (
+            client.table("auth_sessions")
+            .select("user_id,token_hash,expires_at,revoked_at,last_seen_at")
+            .eq("session_id", str(session_id))
+            .limit(1)
+            .execute()
+            .data
+        )
     except Exception as exc:
         _set_auth_error("Falha ao consultar sessão no Supabase.", exc)
         return None
@@ -470,7 +517,7 @@ def _supabase_resolve_session(session_id: str, raw_token: str) -> dict[str, Any]
     session = dict(rows[0])
     if session.get("revoked_at"):
         return None
-    if str(session.get("token_hash", "")) != _token_hash(raw_token):
+    if not hmac.compare_digest(str(session.get("token_hash") or ""), _token_hash(raw_token)):
         return None
     try:
         if datetime.fromisoformat(str(session.get("expires_at", ""))) <= _utc_now():
@@ -478,10 +525,16 @@ def _supabase_resolve_session(session_id: str, raw_token: str) -> dict[str, Any]
     except Exception:
         return None
     user_id = int(session.get("user_id", 0))
-    try:
-        client.table("auth_sessions").update({"last_seen_at": _utc_now().isoformat()}).eq("session_id", str(session_id)).execute()
-    except Exception:
-        pass
+    if _session_touch_due(session.get("last_seen_at")):
+        try:
+            (
+                client.table("auth_sessions")
+                .update({"last_seen_at": _utc_now().isoformat()})
+                .eq("session_id", str(session_id))
+                .execute()
+            )
+        except Exception:
+            pass
     try:
         user_rows = client.table("usuarios").select("username").eq("id", user_id).limit(1).execute().data
     except Exception as exc:
@@ -540,23 +593,29 @@ def _maybe_rotate_session(session: dict[str, Any]) -> None:
 
 
 def _has_non_admin_user() -> bool:
+    global _NON_ADMIN_USER_PRESENT
+    if _NON_ADMIN_USER_PRESENT:
+        return True
     client = get_supabase_client()
     if not client:
         return False
     try:
         rows = client.table("usuarios").select("id").neq("username", "admin").limit(1).execute().data
-        return bool(rows)
     except Exception:
         return False
+    _NON_ADMIN_USER_PRESENT = bool(rows)
+    return _NON_ADMIN_USER_PRESENT
 
 
 def ensure_default_admin() -> None:
+    global _DEFAULT_ADMIN_PRESENT
     settings = get_settings()
-    if settings.app_env != "dev":
+    if settings.app_env != "dev" or _DEFAULT_ADMIN_PRESENT:
         return
     if _get_user("admin"):
+        _DEFAULT_ADMIN_PRESENT = True
         return
-    _upsert_user(
+    _DEFAULT_ADMIN_PRESENT = _upsert_user(
         {
             "username": "admin",
             "password_hash": hash_password("admin"),
@@ -614,18 +673,8 @@ def login_required() -> bool:
     st_runtime = _require_streamlit()
     state = _session_state()
 
-    if "authenticated" not in state:
-        state["authenticated"] = False
-    if "current_user" not in state:
-        state["current_user"] = ""
-    if "current_user_id" not in state:
-        state["current_user_id"] = None
-    if "session_id" not in state:
-        state["session_id"] = ""
-    if "session_token" not in state:
-        state["session_token"] = ""
-    if "must_change_password" not in state:
-        state["must_change_password"] = False
+    for key, default in _SESSION_DEFAULTS.items():
+        state.setdefault(key, default)
 
     _restore_session_from_cookie()
     _render_cookie_sync()
@@ -697,7 +746,8 @@ def login_required() -> bool:
         if submitted:
             _clear_auth_error()
             username_n = _normalize_username(username)
-            if _rate_limited("login", username_n):
+            failures, blocked = _rate_limit_status("login", username_n)
+            if blocked:
                 st_runtime.error("Muitas tentativas. Tente novamente mais tarde.")
                 st_runtime.stop()
             authenticated, auth_user = _authenticate_user(username_n, password)
@@ -705,7 +755,7 @@ def login_required() -> bool:
                 _rate_limit_failure("login", username_n)
                 st_runtime.error(_get_auth_error() or "Usuário ou senha inválidos.")
                 st_runtime.stop()
-            _rate_limit_success("login", username_n)
+            _rate_limit_success("login", username_n, failures)
             try:
                 _upgrade_password_if_needed(auth_user, password)
             except Exception:
@@ -717,7 +767,7 @@ def login_required() -> bool:
                 st_runtime.stop()
             state["authenticated"] = True
             state["current_user"] = str(auth_user.get("username", username_n))
-            state["current_user_id"] = _get_user_id(_get_user(state["current_user"]) or auth_user)
+            state["current_user_id"] = _get_user_id(auth_user)
             state["session_id"] = session[0]
             state["session_token"] = session[1]
             state["must_change_password"] = bool(int(auth_user.get("must_change_password", 0) or 0))
@@ -782,23 +832,31 @@ def login_required() -> bool:
         confirm = st_runtime.text_input("Confirmar nova senha", type="password", key="alt_confirmar")
         if st_runtime.button("Alterar senha"):
             _clear_auth_error()
-            authenticated, auth_user = _authenticate_user(username, current)
-            if not authenticated or not auth_user:
-                st_runtime.error(_get_auth_error() or "Usuário ou senha inválidos.")
-            elif not new_pass:
+            username_n = _normalize_username(username)
+            failures, blocked = _rate_limit_status("login", username_n)
+            # Cheap form checks and the login lockout run before the Argon2 verify.
+            if not new_pass:
                 st_runtime.error("Informe a nova senha.")
             elif new_pass != confirm:
                 st_runtime.error("As senhas não conferem.")
+            elif blocked:
+                st_runtime.error("Muitas tentativas. Tente novamente mais tarde.")
             else:
-                payload = dict(auth_user)
-                payload["password_hash"] = hash_password(new_pass)
-                payload["must_change_password"] = 0
-                wrote = _upsert_user(payload)
-                if wrote:
-                    state["must_change_password"] = False
-                    st_runtime.success("Senha alterada.")
+                authenticated, auth_user = _authenticate_user(username_n, current)
+                if not authenticated or not auth_user:
+                    _rate_limit_failure("login", username_n)
+                    st_runtime.error(_get_auth_error() or "Usuário ou senha inválidos.")
                 else:
-                    st_runtime.error(_get_auth_error() or "Falha ao atualizar senha.")
+                    _rate_limit_success("login", username_n, failures)
+                    payload = dict(auth_user)
+                    payload["password_hash"] = hash_password(new_pass)
+                    payload["must_change_password"] = 0
+                    wrote = _upsert_user(payload)
+                    if wrote:
+                        state["must_change_password"] = False
+                        st_runtime.success("Senha alterada.")
+                    else:
+                        st_runtime.error(_get_auth_error() or "Falha ao atualizar senha.")
 
     with tab_forgot:
         cpf = st_runtime.text_input("CPF", key="rec_cpf")
@@ -816,7 +874,8 @@ def login_required() -> bool:
         if st_runtime.button("Redefinir senha"):
             _clear_auth_error()
             key = f"{_normalize_cpf(cpf)}:{_normalize_username(pergunta)}"
-            if _rate_limited("recovery", key):
+            failures, blocked = _rate_limit_status("recovery", key)
+            if blocked:
                 st_runtime.info("Se os dados estiverem corretos, a solicitação será processada em alguns minutos.")
                 st_runtime.stop()
             # Always return neutral response.
@@ -834,7 +893,7 @@ def login_required() -> bool:
             payload["password_hash"] = hash_password(nova_senha)
             payload["must_change_password"] = 0
             _upsert_user(payload)
-            _rate_limit_success("recovery", key)
+            _rate_limit_success("recovery", key, failures)
             st_runtime.info(neutral)
 
     st_runtime.stop()
@@ -24,18 +24,26 @@ class Settings:
     session_rotation_hours: int = 24
 
 
+def _passthrough_cache(func=None, **_options):
+    """Stand-in for Streamlit cache decorators, bare or parametrized."""
+
+    def decorate(target):
+        target.clear = lambda *args, **kwargs: None
+        return target
+
+    return decorate(func) if func is not None else decorate
+
+
 if st and hasattr(st, "cache_data"):
     cache_data = st.cache_data
 else:
-    def cache_data(func):
-        return func
+    cache_data = _passthrough_cache
 
 
 if st and hasattr(st, "cache_resource"):
     cache_resource = st.cache_resource
 else:
-    def cache_resource(func):
-        return func
+    cache_resource = _passthrough_cache
 
 
 def _get_secret(key: str, default: str = "") -> str:
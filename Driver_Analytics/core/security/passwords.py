@@ -19,6 +19,8 @@ except Exception:  # pragma: no cover
 
 
 _ARGON2_PREFIX = "$argon2"
+# Parameters are fixed, so one stateless hasher is shared by every hash/verify call.
+_PASSWORD_HASHER = PasswordHasher() if PasswordHasher is not None else None
 
 
 def legacy_hash_password(plain: str) -> str:
@@ -46,9 +48,8 @@ def hash_password(plain: str) -> str:
     """Hash password using Argon2id, fallback to bcrypt."""
 
     plain_s = str(plain)
-    if PasswordHasher is not None:
-        ph = PasswordHasher()
-        return ph.hash(plain_s)
+    if _PASSWORD_HASHER is not None:
+        return _PASSWORD_HASHER.hash(plain_s)
     if bcrypt is not None:
         return bcrypt.hashpw(plain_s.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
     raise RuntimeError("Nenhum algoritmo de hash seguro disponível (argon2/bcrypt).")
@@ -60,11 +61,10 @@ def verify_password(plain: str, hashed: str) -> bool:
     raw_hash = str(hashed or "")
     plain_s = str(plain)
     if is_argon2_hash(raw_hash):
-        if PasswordHasher is None:
+        if _PASSWORD_HASHER is None:
             return False
-        ph = PasswordHasher()
         try:
-            return bool(ph.verify(raw_hash, plain_s))
+            return bool(_PASSWORD_HASHER.verify(raw_hash, plain_s))
         except Exception:
             return False
     if is_bcrypt_hash(raw_hash):
@@ -106,7 +106,7 @@ def parse_datetime_column(df: pd.DataFrame, column: str) -> pd.DataFrame:
     """Parse DataFrame column into pandas datetime safely."""
 
     safe_df = df.copy() if df is not None else pd.DataFrame()
-    if column in safe_df.columns:
+    if column in safe_df.columns and not pd.api.types.is_datetime64_any_dtype(safe_df[column]):
         safe_df[column] = pd.to_datetime(safe_df[column], errors="coerce")
     return safe_df
 
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Iterable
 
 import pandas as pd
+
 try:
     import streamlit as st
 except Exception:  # pragma: no cover
@@ -13,6 +14,8 @@ except Exception:  # pragma: no cover
 from core.database import get_supabase_client
 from domain.validators import ensure_columns
 
+_INTEGER_COLUMNS = frozenset({"id", "tempo trabalhado", "recorrencia_meses"})
+
 
 def _to_db_record(record: dict) -> dict:
     """Normalize in-memory keys to database keys."""
@@ -52,12 +55,9 @@ def normalize_dataframe(
     safe_df = _from_db_dataframe(df if isinstance(df, pd.DataFrame) else pd.DataFrame())
     safe_df = ensure_columns(safe_df, columns)
 
-    for col in numeric_columns or []:
-        safe_df[col] = pd.to_numeric(safe_df[col], errors="coerce").fillna(0.0)
-        if col in {"id", "tempo trabalhado", "recorrencia_meses"}:
-            safe_df[col] = safe_df[col].astype(int)
-
-    return safe_df
+    numericos = {col: pd.to_numeric(safe_df[col], errors="coerce").fillna(0.0) for col in numeric_columns or []}
+    numericos.update({col: serie.astype(int) for col, serie in numericos.items() if col in _INTEGER_COLUMNS})
+    return safe_df.assign(**numericos) if numericos else safe_df
 
 
 class BaseRepository:
@@ -79,8 +79,13 @@ class BaseRepository:
     def _is_remote(self) -> bool:
         return self._supabase() is not None
 
-    def _list_remote_rows(self, order_by: str | None = None) -> list[dict]:
-        """Read rows from Supabase strictly scoped to the authenticated user."""
+    def _list_remote_rows(
+        self,
+        order_by: str | None = None,
+        periodo: tuple[str, str] | None = None,
+        data_col: str = "data",
+    ) -> list[dict]:
+        """Read rows from Supabase strictly scoped to the authenticated user (optionally inicio <= data_col < fim)."""
 
         client = self._supabase()
         if not client:
@@ -91,6 +96,8 @@ class BaseRepository:
             return []
 
         query = client.table(self.table_name).select("*").eq("user_id", int(user_id))
+        if periodo:
+            query = query.gte(data_col, periodo[0]).lt(data_col, periodo[1])
         if order_by:
             query = query.order(order_by)
         try:
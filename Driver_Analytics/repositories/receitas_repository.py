@@ -26,6 +26,12 @@ class ReceitasRepository(BaseRepository):
         data = self._list_remote_rows()
         return self._normalize(pd.DataFrame(data))
 
+    def listar_periodo(self, inicio: str, fim: str) -> pd.DataFrame:
+        """List receitas with inicio <= data < fim (ISO dates), filtered by the database."""
+
+        data = self._list_remote_rows(periodo=(inicio, fim))
+        return self._normalize(pd.DataFrame(data))
+
     def buscar_por_id(self, item_id: int) -> pd.DataFrame:
         """Get receita by id as standardized dataframe."""
 
@@ -6,6 +6,7 @@ import uuid
 
 import pandas as pd
 
+from core.config import cache_resource
 from repositories.categorias_despesas_repository import CategoriasDespesasRepository
 from repositories.controle_litros_repository import ControleLitrosRepository
 from repositories.controle_km_repository import ControleKMRepository
@@ -276,6 +277,9 @@ class DashboardService:
     def listar_receitas(self) -> pd.DataFrame:
         return self.receitas_repo.listar()
 
+    def listar_receitas_periodo(self, inicio: str, fim: str) -> pd.DataFrame:
+        return self.receitas_repo.listar_periodo(inicio, fim)
+
     def listar_despesas(self) -> pd.DataFrame:
         return self.despesas_repo.listar()
 
@@ -899,3 +903,10 @@ class DashboardService:
 
     def score_mensal(self, df_receitas: pd.DataFrame, df_despesas: pd.DataFrame) -> int:
         return self.metrics.score_mensal(df_receitas, df_despesas, meta=self.obter_daily_goal())
+
+
+@cache_resource
+def get_dashboard_service() -> DashboardService:
+    """Process-wide service instance; it keeps no per-user state (the user id is read on each call)."""
+
+    return DashboardService()
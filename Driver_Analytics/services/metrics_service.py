@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from domain.models import ResumoMensal
@@ -47,14 +48,12 @@ class MetricsService:
         safe_df = parse_datetime_column(self._safe_df(df_receitas, self.RECEITAS_COLS), "data")
         if safe_df.empty:
             return pd.DataFrame(columns=["data", "valor", "registros"])
-        work = safe_df.copy()
+        # parse_datetime_column already returned a private copy.
+        work = safe_df
         work["valor"] = pd.to_numeric(work["valor"], errors="coerce").fillna(0.0)
         work["data"] = work["data"].dt.normalize()
-        return (
-            work.groupby("data", as_index=False)
-            .agg(valor=("valor", "sum"), registros=("id", "count"))
-            .sort_values(by="data")
-        )
+        # Day keys stay datetime64 (int64-backed) and groupby already returns them sorted.
+        return work.groupby("data", as_index=False, sort=True).agg(valor=("valor", "sum"), registros=("id", "count"))
 
     def _build_daily_calendar(
         self,
@@ -92,41 +91,25 @@ class MetricsService:
         return merged
 
     def _streak_info(self, condition: pd.Series) -> dict[str, int | bool]:
-        flags = condition.fillna(False).astype(bool).tolist()
-        if not flags:
+        flags = condition.fillna(False).to_numpy(dtype=np.int8)
+        if not flags.any():
             return {"longest": 0, "current": 0, "previous_record": 0, "new_record": False}
 
-        runs: list[tuple[int, int]] = []
-        start_idx = None
-        for idx, flag in enumerate(flags):
-            if flag and start_idx is None:
-                start_idx = idx
-            if not flag and start_idx is not None:
-                runs.append((start_idx, idx - 1))
-                start_idx = None
-        if start_idx is not None:
-            runs.append((start_idx, len(flags) - 1))
-
-        if not runs:
-            return {"longest": 0, "current": 0, "previous_record": 0, "new_record": False}
-
-        run_lengths = [end - start + 1 for start, end in runs]
-        longest = max(run_lengths)
-
-        current = 0
-        if flags[-1]:
-            current = run_lengths[-1]
+        edges = np.diff(np.concatenate(([0], flags, [0])))
+        run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        longest = int(run_lengths.max())
 
+        ends_active = bool(flags[-1])
+        current = int(run_lengths[-1]) if ends_active else 0
         previous_record = longest
-        if flags[-1]:
-            previous_runs = run_lengths[:-1]
-            previous_record = max(previous_runs) if previous_runs else 0
-        new_record = bool(flags[-1] and current > previous_record and current > 0)
+        if ends_active:
+            previous_record = int(run_lengths[:-1].max()) if run_lengths.size > 1 else 0
+        new_record = bool(ends_active and current > previous_record)
         return {
-            "longest": int(longest),
-            "current": int(current),
-            "previous_record": int(previous_record),
-            "new_record": bool(new_record),
+            "longest": longest,
+            "current": current,
+            "previous_record": previous_record,
+            "new_record": new_record,
         }
 
     def _top_weekday(self, calendar: pd.DataFrame, flag_col: str) -> tuple[str, int]:
@@ -149,7 +132,12 @@ class MetricsService:
         safe_df = parse_datetime_column(safe_df, "data")
         if safe_df.empty:
             return safe_df
-        return safe_df[(safe_df["data"].dt.year == int(ano)) & (safe_df["data"].dt.month == int(mes))]
+        datas = safe_df["data"]
+        if getattr(datas.dt, "tz", None) is not None:
+            datas = datas.dt.tz_localize(None)
+        # One month-truncating cast and one compare instead of separate year and month masks (NaT never matches).
+        meses = datas.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+        return safe_df[meses == np.datetime64(f"{int(ano):04d}-{int(mes):02d}", "M")]
 
     def filtrar_mes_atual(self, df: pd.DataFrame | None) -> pd.DataFrame:
         """Filter dataframe for current year/month."""
@@ -190,8 +178,21 @@ class MetricsService:
     def percentual_meta_batida(self, df_receitas: pd.DataFrame | None, meta: float = 300.0) -> float:
         """Meta achievement percentage."""
 
-        dias = self.dias_trabalhados(df_receitas)
-        return float(safe_divide(self.dias_meta_batida(df_receitas, meta), dias, default=0.0) * 100)
+        return self.resumo_receitas(df_receitas, meta=meta)["percentual_meta"]
+
+    def resumo_receitas(self, df_receitas: pd.DataFrame | None, meta: float = 300.0) -> dict:
+        """Total, daily mean, worked days and % of goal days from a single daily aggregation (plus the daily series)."""
+
+        daily = self._daily_receita(df_receitas)
+        valores = pd.to_numeric(daily["valor"], errors="coerce").fillna(0.0)
+        dias = int(valores.shape[0])
+        return {
+            "total": self.receita_total(df_receitas),
+            "media_diaria": float(valores.mean()) if dias else 0.0,
+            "dias_trabalhados": dias,
+            "percentual_meta": float(safe_divide(int((valores >= float(meta)).sum()), dias, default=0.0) * 100),
+            "diario": pd.Series(valores.to_numpy(), index=pd.DatetimeIndex(daily["data"], name="data"), name="valor"),
+        }
 
     def km_total(self, df_receitas: pd.DataFrame | None) -> float:
         """Total kilometers."""
@@ -262,12 +263,12 @@ class MetricsService:
         safe_df = self._safe_df(df_despesas, self.DESPESAS_COLS)
         if safe_df.empty:
             return 0.0
-        work_df = safe_df.copy()
-        categorias = work_df["categoria"].fillna("").astype(str).str.lower().str.strip()
-        mask = categorias.isin(["combustível", "combustivel"])
+        categorias = safe_df["categoria"].fillna("").astype(str).str.lower().str.strip()
+        mask = categorias.isin(["combustível", "combustivel"]).to_numpy()
         if not mask.any():
             return 0.0
-        return float(pd.to_numeric(work_df.loc[mask, "litros"], errors="coerce").fillna(0.0).sum())
+        litros = pd.to_numeric(safe_df["litros"], errors="coerce").to_numpy(dtype=float)
+        return float(np.nansum(litros, where=mask))
 
     def consumo_medio_km_por_litro(self, df_receitas: pd.DataFrame | None, df_despesas: pd.DataFrame | None) -> float:
         """Average km/l based on total driven kilometers and fueled liters."""
@@ -300,14 +301,15 @@ class MetricsService:
         try:
             df_r = self.filtrar_mes_atual(self._safe_df(df_receitas, self.RECEITAS_COLS))
             df_d = self.filtrar_mes_atual(self._safe_df(df_despesas, self.DESPESAS_COLS))
+            resumo_r = self.resumo_receitas(df_r, meta=meta)
 
             resumo = ResumoMensal(
                 receita_total=self.receita_total(df_r),
                 despesa_total=self.despesa_total(df_d),
                 lucro=self.lucro_bruto(df_r, df_d),
                 margem_pct=self.margem_lucro(df_r, df_d),
-                dias_trabalhados=self.dias_trabalhados(df_r),
-                meta_batida_pct=self.percentual_meta_batida(df_r, meta=meta),
+                dias_trabalhados=resumo_r["dias_trabalhados"],
+                meta_batida_pct=resumo_r["percentual_meta"],
                 receita_por_km=self.receita_por_km(df_r),
                 lucro_por_km=self.lucro_por_km(df_r, df_d),
             )
@@ -0,0 +1,11 @@
+begin;
+
+-- Password recovery filters usuarios by cpf + data_nascimento (plus the secret
+-- answer). The partial unique index on cpf cannot serve that equality lookup
+-- because its predicate (trim(cpf) <> '') is not implied by the query, so each
+-- attempt scanned the table. auth_sessions (session_id primary key) and
+-- auth_rate_limits (primary key on action, key_hash) are already covered.
+create index if not exists idx_usuarios_recovery
+  on public.usuarios (cpf, data_nascimento);
+
+commit;
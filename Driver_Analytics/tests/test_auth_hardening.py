@@ -33,6 +33,36 @@ class AuthHardeningTests(unittest.TestCase):
         two = auth._rate_limit_key_hash("login", "admin")
         self.assertEqual(one, two)
 
+    def test_rate_limit_success_skips_the_write_when_nothing_failed(self):
+        with patch("core.auth._get_rate_limit") as get_mock, patch("core.auth._set_rate_limit") as set_mock:
+            auth._rate_limit_success("login", "admin", 0)
+
+        get_mock.assert_not_called()
+        set_mock.assert_not_called()
+
+    def test_overlapping_failures_each_count_towards_the_lockout(self):
+        store = {("login", "admin"): (8, None)}
+
+        def fake_get(action, key):
+            return store.get((action, key), (0, None))
+
+        def fake_set(action, key, failures, blocked_until):
+            store[(action, key)] = (failures, blocked_until)
+
+        with patch("core.auth._get_rate_limit", side_effect=fake_get), patch(
+            "core.auth._set_rate_limit", side_effect=fake_set
+        ):
+            # Both requests pass the check with the same count before either records its failure.
+            first, first_blocked = auth._rate_limit_status("login", "admin")
+            second, second_blocked = auth._rate_limit_status("login", "admin")
+            auth._rate_limit_failure("login", "admin")
+            auth._rate_limit_failure("login", "admin")
+
+        self.assertEqual((first, second), (8, 8))
+        self.assertFalse(first_blocked or second_blocked)
+        failures, blocked_until = store[("login", "admin")]
+        self.assertEqual(failures, 10)
+        self.assertIsNotNone(blocked_until)
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import unittest
+from unittest.mock import patch
 
 import pandas as pd
 
+from domain.validators import parse_datetime_column
 from services.metrics_service import MetricsService
 
 
@@ -95,6 +97,73 @@ class MetricsServiceTests(unittest.TestCase):
         self.assertTrue(out["new_work_streak_record"])
         self.assertTrue(out["new_meta_hit_streak_record"])
 
+    def test_streak_info_run_lengths(self):
+        flags = pd.Series([True, True, False, True, True, True, False, False, True, True, True, True])
+        out = self.service._streak_info(flags)
+        self.assertEqual(out, {"longest": 4, "current": 4, "previous_record": 3, "new_record": True})
+
+        tied = self.service._streak_info(pd.Series([True, True, False, True, True]))
+        self.assertEqual(tied, {"longest": 2, "current": 2, "previous_record": 2, "new_record": False})
+
+        closed = self.service._streak_info(pd.Series([True, None, True, True, False]))
+        self.assertEqual(closed, {"longest": 2, "current": 0, "previous_record": 2, "new_record": False})
+
+        empty = self.service._streak_info(pd.Series([], dtype=bool))
+        self.assertEqual(empty, {"longest": 0, "current": 0, "previous_record": 0, "new_record": False})
+
+    def test_litros_combustivel_total_soma_apenas_combustivel(self):
+        despesas = pd.DataFrame(
+            [
+                {"id": 1, "data": "2026-02-01", "categoria": "Combustível", "valor": 200.0, "litros": "35.5"},
+                {"id": 2, "data": "2026-02-02", "categoria": " combustivel ", "valor": 100.0, "litros": None},
+                {"id": 3, "data": "2026-02-03", "categoria": "Manutenção", "valor": 90.0, "litros": 12.0},
+                {"id": 4, "data": "2026-02-04", "categoria": "Combustível", "valor": 150.0, "litros": 20.0},
+            ]
+        )
+
+        self.assertAlmostEqual(self.service.litros_combustivel_total(despesas), 55.5)
+        self.assertEqual(self.service.litros_combustivel_total(despesas.iloc[[2]]), 0.0)
+
+    def test_resumo_receitas_agrega_dias_uma_vez(self):
+        receitas = pd.DataFrame(
+            [
+                {"id": 1, "data": "2026-02-01", "valor": 200.0, "km": 1.0},
+                {"id": 2, "data": "2026-02-01", "valor": 150.0, "km": 1.0},
+                {"id": 3, "data": "2026-02-03", "valor": 100.0, "km": 1.0},
+            ]
+        )
+
+        resumo = self.service.resumo_receitas(receitas, meta=300.0)
+
+        self.assertAlmostEqual(resumo["total"], self.service.receita_total(receitas))
+        self.assertAlmostEqual(resumo["media_diaria"], self.service.receita_media_diaria(receitas))
+        self.assertEqual(resumo["dias_trabalhados"], self.service.dias_trabalhados(receitas))
+        self.assertAlmostEqual(resumo["percentual_meta"], self.service.percentual_meta_batida(receitas, meta=300.0))
+        self.assertEqual(resumo["diario"].tolist(), [350.0, 100.0])
+        self.assertEqual(self.service.resumo_receitas(None)["dias_trabalhados"], 0)
+
+    def test_filtrar_mes_compara_mes_truncado(self):
+        receitas = pd.DataFrame(
+            [
+                {"id": 1, "data": "2026-01-31 23:59:59", "valor": 10.0, "km": 1.0},
+                {"id": 2, "data": "2026-02-01 00:00:00", "valor": 20.0, "km": 1.0},
+                {"id": 3, "data": "2026-02-28 18:00:00", "valor": 30.0, "km": 1.0},
+                {"id": 4, "data": "invalida", "valor": 40.0, "km": 1.0},
+                {"id": 5, "data": "2027-02-10 08:00:00", "valor": 50.0, "km": 1.0},
+            ]
+        )
+
+        self.assertEqual(self.service.filtrar_mes(receitas, 2026, 2)["id"].tolist(), [2, 3])
+        self.assertTrue(self.service.filtrar_mes(receitas.iloc[0:0], 2026, 2).empty)
+
+    def test_parse_datetime_column_keeps_already_typed_column(self):
+        receitas = pd.DataFrame({"data": pd.to_datetime(["2026-02-01", "2026-02-02"]), "valor": [1.0, 2.0]})
+        with patch("domain.validators.pd.to_datetime") as to_datetime:
+            parsed = parse_datetime_column(receitas, "data")
+
+        to_datetime.assert_not_called()
+        self.assertTrue(parsed["data"].equals(receitas["data"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -171,6 +171,65 @@ class RegressionTests(unittest.TestCase):
         self.assertEqual(_display_record_number(df, 18), 2)
         self.assertTrue(_receita_label(df, 18).startswith("Registro 2 |"))
 
+    def test_record_lookup_uses_cached_id_index(self):
+        import pandas as pd
+
+        from UI.cadastros_ui import _display_record_number, _get_row_by_id
+        from UI.data_cache import RECORD_INDEX_NAME
+
+        df = pd.DataFrame([{"id": 20, "valor": 100.0}, {"id": 18, "valor": 90.0}, {"id": 17, "valor": 80.0}])
+        df.index = pd.Index(df["id"].to_numpy(), name=RECORD_INDEX_NAME)
+
+        self.assertEqual(float(_get_row_by_id(df, 18)["valor"]), 90.0)
+        self.assertIsNone(_get_row_by_id(df, 99))
+        self.assertEqual(_display_record_number(df, 17), 3)
+        self.assertIsNone(_display_record_number(df, 99))
+
+    def test_brazilian_number_formatters_agree(self):
+        import pandas as pd
+
+        from UI.components import formatar_moeda, formatar_moeda_series, formatar_numero
+
+        self.assertEqual(formatar_moeda(1234567.891), "R$ 1.234.567,89")
+        self.assertEqual(formatar_numero(1234.5, "km"), "1.234,50 km")
+        self.assertEqual(
+            formatar_moeda_series(pd.Series([1234.5, "x", None])).tolist(),
+            ["R$ 1.234,50", "R$ 0,00", "R$ 0,00"],
+        )
+
+    def test_period_slice_matches_mask_on_sorted_and_unsorted_dates(self):
+        import pandas as pd
+
+        from UI.data_cache import fatiar_periodo
+
+        datas = pd.to_datetime(
+            ["2026-01-31", "2026-02-01", "2026-02-15", "2026-02-28 23:00:00", "2026-03-01 00:00:00"],
+            format="ISO8601",
+        )
+        ordenado = pd.DataFrame({"data": datas, "valor": range(5)})
+        inicio, fim = pd.Timestamp("2026-02-01"), pd.Timestamp("2026-03-01")
+
+        self.assertEqual(fatiar_periodo(ordenado, "data", inicio, fim)["valor"].tolist(), [1, 2, 3])
+        embaralhado = ordenado.iloc[[4, 2, 0, 3, 1]]
+        self.assertEqual(sorted(fatiar_periodo(embaralhado, "data", inicio, fim)["valor"].tolist()), [1, 2, 3])
+
+    def test_investment_projection_matches_compound_formula(self):
+        import pandas as pd
+
+        from Metrics.analytics_investimentos import projecao_com_aporte
+        from UI.investimentos_ui import _projecao_mensal
+
+        base = pd.DataFrame([{"data": pd.Timestamp("2026-01-01"), "patrimonio_total": 1000.0}])
+        proj = _projecao_mensal(1000.0, 0.01, 24, 100.0)
+        self.assertEqual(proj["mes"].tolist(), list(range(25)))
+        for mes in (0, 1, 12, 24):
+            esperado = float(projecao_com_aporte(base, 0.01, mes, 100.0))
+            self.assertAlmostEqual(float(proj.loc[mes, "patrimonio"]), esperado, places=6)
+
+        sem_juros = _projecao_mensal(1000.0, 0.0, 5, 100.0)
+        self.assertEqual(float(sem_juros["patrimonio"].iloc[-1]), 1500.0)
+        self.assertEqual(float(sem_juros["juros_acumulados"].max()), 0.0)
+
     def test_function_search_path_migration_targets_flagged_functions(self):
         migration_path = PROJECT_ROOT / "sql" / "migrations" / "20260318100000__harden_function_search_paths.sql"
         source = migration_path.read_text(encoding="utf-8")
@@ -232,6 +291,13 @@ class RegressionTests(unittest.TestCase):
         self.assertIn("grant select, insert, update, delete on table public.auth_rate_limits to service_role", source)
         self.assertIn("create policy auth_rate_limits_backend_only", source)
 
+    def test_recovery_index_migration_covers_cpf_lookup(self):
+        migration_path = PROJECT_ROOT / "sql" / "migrations" / "20260322100000__add_usuarios_recovery_index.sql"
+        source = migration_path.read_text(encoding="utf-8")
+
+        self.assertIn("create index if not exists idx_usuarios_recovery", source)
+        self.assertIn("on public.usuarios (cpf, data_nascimento)", source)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -39,6 +39,14 @@ class _FakeTable:
         self._filters.append((f"ilike:{column}", str(value)))
         return self
 
+    def gte(self, column, value):
+        self._filters.append((f"gte:{column}", value))
+        return self
+
+    def lt(self, column, value):
+        self._filters.append((f"lt:{column}", value))
+        return self
+
     def order(self, column):
         self._order_by = str(column)
         return self
@@ -49,6 +57,10 @@ class _FakeTable:
             if column.startswith("ilike:"):
                 raw_column = column.split(":", 1)[1]
                 rows = [row for row in rows if str(row.get(raw_column, "")).casefold() == str(value).casefold()]
+            elif column.startswith("gte:"):
+                rows = [row for row in rows if str(row.get(column[4:], "")) >= str(value)]
+            elif column.startswith("lt:"):
+                rows = [row for row in rows if str(row.get(column[3:], "")) < str(value)]
             else:
                 rows = [row for row in rows if row.get(column) == value]
         if self._order_by:
@@ -121,6 +133,24 @@ class RepositoryTests(unittest.TestCase):
         self.assertAlmostEqual(float(df.iloc[0]["valor"]), 100.0)
         self.assertEqual(int(df.iloc[0]["tempo trabalhado"]), 3600)
 
+    @patch("repositories.receitas_repository.ReceitasRepository._current_user_id")
+    @patch("repositories.receitas_repository.ReceitasRepository._supabase")
+    def test_listar_periodo_receitas_filtra_mes_no_banco(self, supabase_mock, current_user_id_mock):
+        current_user_id_mock.return_value = 10
+        supabase_mock.return_value = _FakeClient(
+            [
+                {"id": 1, "user_id": 10, "data": "2026-01-31", "valor": 10.0},
+                {"id": 2, "user_id": 10, "data": "2026-02-01", "valor": 20.0},
+                {"id": 3, "user_id": 10, "data": "2026-02-28", "valor": 30.0},
+                {"id": 4, "user_id": 10, "data": "2026-03-01", "valor": 40.0},
+                {"id": 5, "user_id": 99, "data": "2026-02-10", "valor": 999.0},
+            ]
+        )
+
+        df = ReceitasRepository().listar_periodo("2026-02-01", "2026-03-01")
+
+        self.assertEqual(df["id"].tolist(), [2, 3])
+
     @patch("repositories.base_repository.BaseRepository._supabase")
     @patch("repositories.base_repository.BaseRepository._current_user_id")
     def test_list_remote_rows_returns_only_authenticated_user_rows(self, current_user_id_mock, supabase_mock):
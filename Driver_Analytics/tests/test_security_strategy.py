@@ -48,6 +48,10 @@ class _RecordingTable:
         self.filters.append((f"ilike:{column}", str(value)))
         return self
 
+    def neq(self, column, value):
+        self.filters.append((f"neq:{column}", value))
+        return self
+
     def order(self, _column):
         return self
 
@@ -88,6 +92,9 @@ class _RecordingTable:
             if column.startswith("ilike:"):
                 raw_column = column.split(":", 1)[1]
                 rows = [row for row in rows if str(row.get(raw_column, "")).casefold() == str(value).casefold()]
+            elif column.startswith("neq:"):
+                raw_column = column.split(":", 1)[1]
+                rows = [row for row in rows if row.get(raw_column) != value]
             else:
                 rows = [row for row in rows if row.get(column) == value]
         if self._limit is not None:
@@ -159,6 +166,31 @@ class SecurityStrategyTests(unittest.TestCase):
         self.assertEqual(message, "")
         self.assertEqual([call["table"] for call in client.calls], ["usuarios", "auth_sessions"])
 
+    @patch("core.auth.is_backend_supabase_key", return_value=True)
+    @patch("core.auth.get_supabase_key_role", return_value="service_role")
+    @patch("core.auth.get_supabase_client_status")
+    def test_auth_schema_check_probes_each_client_once(self, get_client_status_mock, _key_role_mock, _backend_key_mock):
+        client = _RecordingClient({"usuarios": [{"id": 1}], "auth_sessions": [{"session_id": "s1"}]})
+        get_client_status_mock.return_value = (client, "")
+
+        self.assertEqual(auth._check_remote_auth_schema(), (True, ""))
+        self.assertEqual(auth._check_remote_auth_schema(), (True, ""))
+
+        self.assertEqual([call["table"] for call in client.calls], ["usuarios", "auth_sessions"])
+
+    @patch("core.auth.get_supabase_client")
+    def test_registration_lock_queries_until_a_user_exists(self, get_client_mock):
+        client = _RecordingClient({"usuarios": [{"id": 1, "username": "admin"}]})
+        get_client_mock.return_value = client
+
+        with patch.object(auth, "_NON_ADMIN_USER_PRESENT", False):
+            self.assertFalse(auth._has_non_admin_user())
+            client.data["usuarios"].append({"id": 2, "username": "alice"})
+            self.assertTrue(auth._has_non_admin_user())
+            self.assertTrue(auth._has_non_admin_user())
+
+        self.assertEqual(len(client.calls), 2)
+
     @patch("core.auth.get_supabase_client")
     def test_resolve_session_keeps_auth_flow_functional_with_backend_tables(self, get_client_mock):
         token = "raw-token"
@@ -182,8 +214,35 @@ class SecurityStrategyTests(unittest.TestCase):
         session = auth._supabase_resolve_session("sess-1", token)
 
         self.assertEqual(session["user_id"], 10)
+        self.assertEqual(session["username"], "alice")
+        # last_seen_at is recent, so the session row is not touched again.
+        self.assertEqual([call["table"] for call in client.calls], ["auth_sessions", "usuarios"])
+
+    @patch("core.auth.get_supabase_client")
+    def test_resolve_session_refreshes_stale_last_seen(self, get_client_mock):
+        token = "raw-token"
+        client = _RecordingClient(
+            {
+                "auth_sessions": [
+                    {
+                        "session_id": "sess-1",
+                        "user_id": 10,
+                        "token_hash": hashlib.sha256(token.encode("utf-8")).hexdigest(),
+                        "expires_at": "2099-01-01T00:00:00+00:00",
+                        "revoked_at": None,
+                        "last_seen_at": "2020-01-01T00:00:00+00:00",
+                    }
+                ],
+                "usuarios": [{"id": 10, "username": "alice"}],
+            }
+        )
+        get_client_mock.return_value = client
+
+        session = auth._supabase_resolve_session("sess-1", token)
+
         self.assertEqual(session["username"], "alice")
         self.assertEqual([call["table"] for call in client.calls], ["auth_sessions", "auth_sessions", "usuarios"])
+        self.assertEqual(client.calls[1]["operation"], "update")
 
     @patch("core.auth.get_supabase_client")
     def test_authenticate_user_accepts_username_with_different_case(self, get_client_mock):